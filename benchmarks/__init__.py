@@ -0,0 +1,13 @@
+"""Module "benchmarks".
+About:
+    Offline microbenchmarks of the service hot paths.
+    Benchmarks do not connect to external services
+    (except db_backends, given a MySQL server), so required
+    service settings get placeholder values.
+"""
+
+import os
+
+os.environ.setdefault("GROUPID", "0")
+os.environ.setdefault("SQL_PORT", "3306")
+os.environ.setdefault("DB_BACKEND", "memory")
@@ -0,0 +1,126 @@
+"""MySQL backends benchmark.
+Compares MySQLdb on a thread pool ("mysql") with
+the asyncio driver ("aiomysql") at several counts of
+concurrent events. Unlike other benchmarks, it needs
+a MySQL server (or a compatible one) and only reads from it.
+
+Usage:
+    python -m benchmarks.db_backends [--host 127.0.0.1] [--port 3306]
+        [--user root] [--password ""] [--events 1000]
+        [--concurrency 1 10 100] [--schema toaster] [--table conversations]
+"""
+
+import time
+import asyncio
+import argparse
+from db.database import DataBase
+from db.execute import template_cache_info
+
+BACKENDS = ("mysql", "aiomysql")
+
+
+async def handle_event(database: DataBase, schema: str, table: str, index: int):
+    """Makes DB queries of a typical action: a select by the conversation."""
+    return await database.execute.select(
+        schema=schema, table=table, conv_id=2000000000 + index % 100
+    )
+
+
+async def run(database: DataBase, args, concurrency: int) -> tuple:
+    """Handles events with at most "concurrency" of them at once.
+
+    Returns:
+        tuple: Elapsed time and sorted event latencies.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def event(index: int):
+        async with semaphore:
+            started = time.perf_counter()
+            await handle_event(database, args.schema, args.table, index)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[event(index) for index in range(args.events)])
+    elapsed = time.perf_counter() - started
+
+    return elapsed, sorted(latencies)
+
+
+async def check(databases: dict, args):
+    """Checks that the backends return the same rows."""
+    results = {
+        backend: [
+            await handle_event(database, args.schema, args.table, index)
+            for index in range(10)
+        ]
+        for backend, database in databases.items()
+    }
+    expected = [[tuple(row) for row in rows] for rows in results[BACKENDS[0]]]
+
+    for backend, result in results.items():
+        if [[tuple(row) for row in rows] for rows in result] != expected:
+            raise SystemExit(f'Backend "{backend}" returned different rows')
+
+
+async def benchmark(args):
+    pool_size = max(args.concurrency)
+    databases = {
+        backend: DataBase(
+            host=args.host,
+            port=args.port,
+            user=args.user,
+            password=args.password,
+            backend=backend,
+            pool_size=min(pool_size, args.pool_size),
+        )
+        for backend in BACKENDS
+    }
+
+    try:
+        await check(databases, args)
+
+        # Open pool connections before measuring.
+        for database in databases.values():
+            await run(database, args, pool_size)
+
+        for concurrency in args.concurrency:
+            for backend, database in databases.items():
+                elapsed, latencies = await run(database, args, concurrency)
+                p50 = latencies[len(latencies) // 2] * 1000
+                p99 = latencies[int(len(latencies) * 0.99)] * 1000
+
+                print(
+                    f"{backend:<10} x{concurrency:<4} "
+                    f"{args.events / elapsed:>9.0f} events/s "
+                    f"p50 {p50:>7.2f} ms  p99 {p99:>7.2f} ms"
+                )
+
+    finally:
+        for database in databases.values():
+            await database.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MySQL backends benchmark.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3306)
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--schema", default="toaster")
+    parser.add_argument("--table", default="conversations")
+    args = parser.parse_args()
+
+    print(f"{args.events} events, {args.schema}.{args.table}")
+    asyncio.run(benchmark(args))
+
+    info = template_cache_info()
+    print(f"Query templates: {info.hits} hits, {info.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Message decoding microbenchmark.
+Compares the legacy bytes -> str -> dict path
+with the consumer codecs.
+
+Usage:
+    python -m benchmarks.decode [capture.jsonl] [--number N]
+"""
+
+import json
+import timeit
+import argparse
+from consumer import TrafficRecorder
+from consumer.codecs import JSONCodec, MsgpackCodec, codecs, msgpack
+
+SAMPLE_EVENT = {
+    "ts": 1709107935,
+    "datetime": "2024-02-28 11:12:15",
+    "event_type": "button_pressed",
+    "event_id": "e93488a3813b59f6c6b53ee51f59103e2a9240d6",
+    "user_id": 206295116,
+    "user_name": "Руслан Башинский",
+    "user_nick": "oidaho",
+    "peer_id": 2000000002,
+    "peer_name": "FUNCKA | DEV | CHAT",
+    "chat_id": 2,
+    "cmid": 2618,
+    "button_event_id": "ac89a3425ec3",
+    "payload": {"keyboard_owner_id": 206295116, "call_action": "test"},
+}
+
+
+def load_payloads(path: str) -> list:
+    """Returns JSON message bodies from the capture file
+    written with CAPTURE_PATH.
+
+    Args:
+        path (str): Path to capture file.
+
+    Returns:
+        list: Message bodies.
+    """
+    if path is None:
+        return [json.dumps(SAMPLE_EVENT, ensure_ascii=False).encode("utf-8")]
+
+    return [
+        record["body"]
+        for record in TrafficRecorder.load(path)
+        if codecs.get(record.get("content_type")) is JSONCodec
+    ]
+
+
+def legacy_decode(body: bytes) -> dict:
+    return json.loads(body.decode("utf-8"))
+
+
+def run(name: str, decode, payloads: list, number: int):
+    def decode_all():
+        for body in payloads:
+            decode(body)
+
+    elapsed = timeit.timeit(decode_all, number=number)
+    per_message = elapsed / (number * len(payloads)) * 1e9
+
+    print(f"{name:<20} {per_message:>10.0f} ns/msg")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Message decoding benchmark.")
+    parser.add_argument("capture", nargs="?", help="file written with CAPTURE_PATH")
+    parser.add_argument("--number", type=int, default=10000)
+    args = parser.parse_args()
+
+    payloads = load_payloads(args.capture)
+    print(f"{len(payloads)} payloads x {args.number} rounds")
+
+    run("legacy json", legacy_decode, payloads, args.number)
+    run("codec json", JSONCodec.decode, payloads, args.number)
+
+    views = [memoryview(body) for body in payloads]
+    run("codec json (view)", JSONCodec.decode, views, args.number)
+
+    if msgpack is not None:
+        packed = [MsgpackCodec.encode(JSONCodec.decode(body)) for body in payloads]
+        run("codec msgpack", MsgpackCodec.decode, packed, args.number)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,27 +5,117 @@ About:
 
 from .config import (
     QUEUE_BROKER_IP,
+    CONSUMER_MODE,
+    ACK_MODE,
+    PREFETCH_COUNT,
+    ACK_BATCH_SIZE,
+    ACK_BATCH_INTERVAL,
+    EVENT_TTL,
+    STALE_QUEUE,
+    CAPTURE_PATH,
+    DISPATCH_CONCURRENCY,
+    DISPATCH_QUEUE_SIZE,
+    DEDUP_WINDOW,
+    DEDUP_SIZE,
+    MIDDLEWARES,
+    SLOW_EVENT_THRESHOLD,
+    CLICK_RATE,
+    CLICK_BURST,
+    WORKER_COUNT,
+    WORKER_NAME,
+    SHARD_EXCHANGE,
+    STATS_INTERVAL,
+    METRICS_HOST,
+    METRICS_PORT,
+    LOOP_LAG_INTERVAL,
+    LOOP_BLOCK_THRESHOLD,
+    LOOP_DEBUG,
     TOKEN,
     GROUP_ID,
     SERVICE_NAME,
     API_VERSION,
+    VK_API_URL,
+    VK_POOL_SIZE,
+    VK_TIMEOUT,
+    VK_EXECUTE,
+    VK_BATCH_LINGER,
+    VK_RATE_LIMIT,
+    VK_RATE_BURST,
+    VK_RETRY_ATTEMPTS,
+    VK_RETRY_METHODS,
+    VK_RETRY_DELAY,
+    VK_RETRY_MAX_DELAY,
+    VK_BREAKER_THRESHOLD,
+    VK_BREAKER_RESET,
+    USER_CACHE_TTL,
+    USER_CACHE_SIZE,
+    RENDER_CACHE_SIZE,
     MY_SQL_HOST,
     MY_SQL_PORT,
     MY_SQL_PSWD,
     MY_SQL_USER,
+    DB_BACKEND,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_TEMPLATE_CACHE_SIZE,
     PERMISSIONS_DECODING,
 )
 
 
 __all__ = (
     "QUEUE_BROKER_IP",
+    "CONSUMER_MODE",
+    "ACK_MODE",
+    "PREFETCH_COUNT",
+    "ACK_BATCH_SIZE",
+    "ACK_BATCH_INTERVAL",
+    "EVENT_TTL",
+    "STALE_QUEUE",
+    "CAPTURE_PATH",
+    "DISPATCH_CONCURRENCY",
+    "DISPATCH_QUEUE_SIZE",
+    "DEDUP_WINDOW",
+    "DEDUP_SIZE",
+    "MIDDLEWARES",
+    "SLOW_EVENT_THRESHOLD",
+    "CLICK_RATE",
+    "CLICK_BURST",
+    "WORKER_COUNT",
+    "WORKER_NAME",
+    "SHARD_EXCHANGE",
+    "STATS_INTERVAL",
+    "METRICS_HOST",
+    "METRICS_PORT",
+    "LOOP_LAG_INTERVAL",
+    "LOOP_BLOCK_THRESHOLD",
+    "LOOP_DEBUG",
     "TOKEN",
     "GROUP_ID",
     "SERVICE_NAME",
     "API_VERSION",
+    "VK_API_URL",
+    "VK_POOL_SIZE",
+    "VK_TIMEOUT",
+    "VK_EXECUTE",
+    "VK_BATCH_LINGER",
+    "VK_RATE_LIMIT",
+    "VK_RATE_BURST",
+    "VK_RETRY_ATTEMPTS",
+    "VK_RETRY_METHODS",
+    "VK_RETRY_DELAY",
+    "VK_RETRY_MAX_DELAY",
+    "VK_BREAKER_THRESHOLD",
+    "VK_BREAKER_RESET",
+    "USER_CACHE_TTL",
+    "USER_CACHE_SIZE",
+    "RENDER_CACHE_SIZE",
     "MY_SQL_HOST",
     "MY_SQL_PORT",
     "MY_SQL_PSWD",
     "MY_SQL_USER",
+    "DB_BACKEND",
+    "DB_POOL_SIZE",
+    "DB_POOL_TIMEOUT",
+    "DB_TEMPLATE_CACHE_SIZE",
     "PERMISSIONS_DECODING",
 )
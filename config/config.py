@@ -5,15 +5,114 @@ import os
 SERVICE_NAME = "toaster.button-handling-service"
 
 QUEUE_BROKER_IP = "172.18.0.40"
+# "async" - asyncio consumer, "blocking" - legacy blocking consumer
+CONSUMER_MODE: str = os.getenv("CONSUMER_MODE", "async")
+# "manual" - ack after handling, "auto" - ack on delivery (async mode only)
+ACK_MODE: str = os.getenv("ACK_MODE", "manual")
+PREFETCH_COUNT: int = int(os.getenv("PREFETCH_COUNT", "64"))
+ACK_BATCH_SIZE: int = int(os.getenv("ACK_BATCH_SIZE", "16"))
+ACK_BATCH_INTERVAL: float = float(os.getenv("ACK_BATCH_INTERVAL", "0.2"))
+# Events older than TTL seconds are not handled (0 - disabled)
+EVENT_TTL: float = float(os.getenv("EVENT_TTL", "30"))
+# Queue for stale events audit (empty - stale events are dropped)
+STALE_QUEUE: str = os.getenv("STALE_QUEUE", "")
+# Raw deliveries are appended to this JSONL file (empty - disabled)
+CAPTURE_PATH: str = os.getenv("CAPTURE_PATH", "")
+
+# Count of conversation shards handled concurrently
+DISPATCH_CONCURRENCY: int = int(os.getenv("DISPATCH_CONCURRENCY", "16"))
+# Maximum count of events queued in all shards. In manual ack mode
+# deliveries are also bounded by PREFETCH_COUNT
+DISPATCH_QUEUE_SIZE: int = int(os.getenv("DISPATCH_QUEUE_SIZE", "512"))
+
+# Repeated clicks within the window are suppressed (0 - disabled)
+DEDUP_WINDOW: float = float(os.getenv("DEDUP_WINDOW", "0.5"))
+DEDUP_SIZE: int = int(os.getenv("DEDUP_SIZE", "10000"))
+
+# Default action middleware chain, outermost first
+MIDDLEWARES: tuple = tuple(
+    os.getenv("MIDDLEWARES", "errors,timing,dedup,rate_limit").split(",")
+)
+# Actions slower than threshold seconds are logged (0 - disabled)
+SLOW_EVENT_THRESHOLD: float = float(os.getenv("SLOW_EVENT_THRESHOLD", "1.0"))
+# Per user clicks limit (0 - disabled)
+CLICK_RATE: float = float(os.getenv("CLICK_RATE", "5"))
+CLICK_BURST: int = int(os.getenv("CLICK_BURST", "10"))
+
+# Multi-process mode (supervisor.py). The shard router waits
+# for the broker confirm of every message, so the throughput
+# is capped at about 1 / RTT to the broker messages per second
+# (~1000/s at 1 ms), however many workers there are.
+WORKER_COUNT: int = int(os.getenv("WORKER_COUNT", str(os.cpu_count() or 1)))
+WORKER_NAME: str = os.getenv("WORKER_NAME")
+SHARD_EXCHANGE: str = os.getenv("SHARD_EXCHANGE", "buttons.shards")
+STATS_INTERVAL: float = float(os.getenv("STATS_INTERVAL", "10"))
+
+METRICS_HOST: str = os.getenv("METRICS_HOST", "0.0.0.0")
+# 0 disables the metrics endpoint.
+METRICS_PORT: int = int(os.getenv("METRICS_PORT", "0"))
+
+# Event loop lag monitor. Blocks longer than the threshold
+# are counted (0 - disabled), debug mode logs their stacks.
+LOOP_LAG_INTERVAL: float = float(os.getenv("LOOP_LAG_INTERVAL", "0.1"))
+LOOP_BLOCK_THRESHOLD: float = float(os.getenv("LOOP_BLOCK_THRESHOLD", "0.1"))
+LOOP_DEBUG: bool = os.getenv("LOOP_DEBUG", "0") == "1"
 
 TOKEN: str = os.getenv("TOKEN")
 GROUP_ID: int = int(os.getenv("GROUPID"))
 API_VERSION: str = "5.199"
+VK_API_URL: str = os.getenv("VK_API_URL", "https://api.vk.com/method")
+# Keep-alive connections to the VK API.
+VK_POOL_SIZE: int = int(os.getenv("VK_POOL_SIZE", "20"))
+VK_TIMEOUT: float = float(os.getenv("VK_TIMEOUT", "10"))
+# Send VK calls of one event in a single "execute" request (0 - disabled).
+VK_EXECUTE: bool = os.getenv("VK_EXECUTE", "1") == "1"
+# Seconds to wait for calls of concurrent events to share an
+# "execute" request (0 - disabled).
+VK_BATCH_LINGER: float = float(os.getenv("VK_BATCH_LINGER", "0"))
+# VK API requests per second of the process (0 - unlimited).
+# Group tokens are limited to 20 requests per second.
+VK_RATE_LIMIT: float = float(os.getenv("VK_RATE_LIMIT", "19"))
+VK_RATE_BURST: int = int(os.getenv("VK_RATE_BURST", "1"))
+# Attempts of VK API requests, also per method: "method=attempts,...".
+# Event answers are worth little once the user gave up waiting.
+VK_RETRY_ATTEMPTS: int = int(os.getenv("VK_RETRY_ATTEMPTS", "3"))
+VK_RETRY_METHODS: dict = {
+    method.strip(): int(attempts)
+    for method, attempts in (
+        item.split("=")
+        for item in os.getenv(
+            "VK_RETRY_METHODS", "messages.sendMessageEventAnswer=2"
+        ).split(",")
+        if item.strip()
+    )
+}
+VK_RETRY_DELAY: float = float(os.getenv("VK_RETRY_DELAY", "0.2"))
+VK_RETRY_MAX_DELAY: float = float(os.getenv("VK_RETRY_MAX_DELAY", "5"))
+# Failures in a row opening the VK API circuit (0 - disabled)
+# and seconds before a probe request.
+VK_BREAKER_THRESHOLD: int = int(os.getenv("VK_BREAKER_THRESHOLD", "5"))
+VK_BREAKER_RESET: float = float(os.getenv("VK_BREAKER_RESET", "10"))
+# User names cache.
+USER_CACHE_TTL: float = float(os.getenv("USER_CACHE_TTL", "3600"))
+USER_CACHE_SIZE: int = int(os.getenv("USER_CACHE_SIZE", "10000"))
+# Menu messages remembered to skip unchanged edits.
+RENDER_CACHE_SIZE: int = int(os.getenv("RENDER_CACHE_SIZE", "10000"))
 
 
 MY_SQL_HOST = os.getenv("SQL_HOST")
 MY_SQL_PORT = int(os.getenv("SQL_PORT"))
 MY_SQL_USER = os.getenv("SQL_USER")
 MY_SQL_PSWD = os.getenv("SQL_PSWD")
+# "mysql" - MySQL server (MySQLdb on a thread pool),
+# "aiomysql" - MySQL server (asyncio driver),
+# "memory" - in-memory tables (replay, benchmarks)
+DB_BACKEND: str = os.getenv("DB_BACKEND", "mysql")
+# MySQL connections (and query threads) per process
+# and seconds a query waits for a free connection.
+DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "4"))
+DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+# Query templates cached by the query shape.
+DB_TEMPLATE_CACHE_SIZE: int = int(os.getenv("DB_TEMPLATE_CACHE_SIZE", "256"))
 
 PERMISSIONS_DECODING = {0: "User", 1: "Moderator", 2: "Administrator"}
@@ -6,7 +6,9 @@ About:
     string.
 """
 
-from .custom import consumer
+from .custom import consumer, async_consumer
+from .router import ShardRouter
+from .capture import TrafficRecorder
 
 
-__all__ = ("consumer",)
+__all__ = ("consumer", "async_consumer", "ShardRouter", "TrafficRecorder")
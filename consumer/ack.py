@@ -0,0 +1,98 @@
+"""Module "consumer"."""
+
+import asyncio
+
+
+class AckBatcher(object):
+    """Groups delivery acknowledgements into
+    basic_ack(multiple=True) calls.
+
+    Deliveries can be completed in any order. The contiguous
+    range of completed delivery tags is acknowledged with one
+    multiple-ack, so it never confirms an event that is still
+    being handled. Deliveries completed past an unfinished one
+    are acknowledged one by one, so a slow event does not hold
+    the acknowledgements back until the prefetch window is full.
+    """
+
+    def __init__(self, channel, batch_size: int, interval: float):
+        self._channel = channel
+        self._batch_size = batch_size
+        self._interval = interval
+
+        # Highest delivery tag below which everything is completed.
+        self._watermark = 0
+        # Completed, but not acknowledged deliveries up to the watermark.
+        self._unacked = 0
+        # Completed, but not acknowledged delivery tags above the watermark.
+        self._completed = set()
+        # Delivery tags above the watermark acknowledged one by one.
+        self._acked = set()
+        self._timer: asyncio.TimerHandle = None
+
+    @property
+    def pending(self) -> int:
+        """Returns the count of completed,
+        but not yet acknowledged deliveries.
+        """
+        return self._unacked + len(self._completed)
+
+    def complete(self, tag: int):
+        """Marks delivery as completed. Sends acknowledgements
+        when batch size is reached, otherwise schedules
+        them after the batch interval.
+
+        Args:
+            tag (int): Delivery tag.
+        """
+        if tag != self._watermark + 1:
+            self._completed.add(tag)
+
+        else:
+            self._watermark = tag
+            self._unacked += 1
+
+            while True:
+                tag = self._watermark + 1
+
+                if tag in self._completed:
+                    self._completed.remove(tag)
+                    self._unacked += 1
+
+                elif tag in self._acked:
+                    self._acked.remove(tag)
+
+                else:
+                    break
+
+                self._watermark = tag
+
+        if self.pending >= self._batch_size:
+            self.flush()
+
+        elif self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self._interval, self.flush)
+
+    def flush(self):
+        """Acknowledges every completed delivery: the ones up to
+        the watermark at once, the rest one by one.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self.pending or not self._channel.is_open:
+            return
+
+        # Deliveries acknowledged one by one are no longer
+        # outstanding, so the multiple-ack skips them.
+        if self._unacked:
+            self._channel.basic_ack(delivery_tag=self._watermark, multiple=True)
+            self._unacked = 0
+
+        for tag in sorted(self._completed):
+            self._channel.basic_ack(delivery_tag=tag, multiple=False)
+
+        self._acked.update(self._completed)
+        self._completed.clear()
@@ -0,0 +1,213 @@
+"""Module "consumer"."""
+
+import time
+import asyncio
+import pika
+from pika.adapters.asyncio_connection import AsyncioConnection
+import config
+from logger import logger
+from metrics import registry
+from .ack import AckBatcher
+from .codecs import codecs
+from .stale import StaleFilter
+from .capture import TrafficRecorder
+
+ACK_LAG = registry.histogram(
+    "consumer_ack_lag_seconds", "Time from delivery to acknowledgement."
+).labels()
+
+
+class AsyncConsumer(object):
+    """Asyncio consumer class.
+    Runs the RabbitMQ connection on the service event loop,
+    so broker heartbeats and incoming deliveries are served
+    while event handlers are awaited.
+    """
+
+    def __init__(self):
+        self._connection: AsyncioConnection = None
+        self._channel = None
+        self._deliveries: asyncio.Queue = None
+        self._acks: AckBatcher = None
+        self.stale = StaleFilter(config.EVENT_TTL)
+        self.recorder: TrafficRecorder = None
+        self.received = 0
+
+        # Delivery receive times by tag. No more than PREFETCH_COUNT
+        # deliveries are unacknowledged, so a ring twice as large
+        # is never overwritten before the acknowledgement.
+        self._received_at = [0.0] * (2 * max(config.PREFETCH_COUNT, 1))
+
+        if config.CAPTURE_PATH:
+            self.recorder = TrafficRecorder(config.CAPTURE_PATH)
+
+    @property
+    def manual_ack(self) -> bool:
+        """Returns True if deliveries have to be
+        acknowledged after handling.
+        """
+        return config.ACK_MODE == "manual"
+
+    async def listen_queue(self, queue: str):
+        """Listen to the queue inside RabbitMQ.
+        When receiving data, decodes it to dict object
+        with the codec matching message content type.
+        Undecodable messages are logged and dropped, stale
+        ones are dropped or moved to STALE_QUEUE.
+
+        In manual acknowledgement mode the broker sends no more
+        than PREFETCH_COUNT unacknowledged deliveries, and each
+        of them must be passed to ack() once handled.
+
+        Args:
+            queue (str): Queue name in RabbitMQ.
+
+        Yields:
+            AsyncIterator[tuple]: Delivery tag and JSON event data.
+        """
+        await self._connect()
+        await self._declare(queue)
+
+        if config.STALE_QUEUE:
+            await self._declare(config.STALE_QUEUE)
+
+        if self.manual_ack:
+            await self._qos(config.PREFETCH_COUNT)
+            self._acks = AckBatcher(
+                self._channel,
+                batch_size=config.ACK_BATCH_SIZE,
+                interval=config.ACK_BATCH_INTERVAL,
+            )
+
+        self._channel.basic_consume(
+            queue=queue,
+            on_message_callback=self._on_message,
+            auto_ack=not self.manual_ack,
+        )
+
+        while True:
+            delivery = await self._deliveries.get()
+
+            if isinstance(delivery, Exception):
+                raise delivery
+
+            tag, properties, body = delivery
+
+            if self.recorder is not None:
+                self.recorder.record(properties, body)
+
+            # Checked before decoding, if timestamp is in properties.
+            if self._is_stale(properties):
+                self._shed(tag, properties, body)
+                continue
+
+            try:
+                data = self._deserialize(body, properties.content_type)
+
+            except ValueError as error:
+                log_text = f"Dropped undecodable message <{tag}>: {error}"
+                await logger.warning(log_text)
+
+                self.ack(tag)
+                continue
+
+            if not isinstance(data, dict):
+                log_text = f"Dropped message <{tag}>: event is not an object"
+                await logger.warning(log_text)
+
+                self.ack(tag)
+                continue
+
+            if self._is_stale(properties, data):
+                self._shed(tag, properties, body)
+                continue
+
+            yield tag, data
+
+    def ack(self, tag: int):
+        """Marks delivery as handled. Acknowledgements
+        are sent to the broker in batches.
+
+        Args:
+            tag (int): Delivery tag.
+        """
+        if self._acks is None or tag is None:
+            return
+
+        received_at = self._received_at[tag % len(self._received_at)]
+        ACK_LAG.observe(time.monotonic() - received_at)
+
+        self._acks.complete(tag)
+
+    def _is_stale(self, properties, event: dict = None) -> bool:
+        if not self.stale.enabled:
+            return False
+
+        return self.stale.is_stale(self.stale.produced_at(properties, event))
+
+    def _shed(self, tag: int, properties, body: bytes):
+        if config.STALE_QUEUE:
+            self._channel.basic_publish(
+                exchange="",
+                routing_key=config.STALE_QUEUE,
+                body=body,
+                properties=properties,
+            )
+
+        self.ack(tag)
+
+    async def _connect(self):
+        """Opens connection and channel on the running event loop."""
+        loop = asyncio.get_running_loop()
+        self._deliveries = asyncio.Queue()
+
+        opened = loop.create_future()
+        self._connection = AsyncioConnection(
+            pika.ConnectionParameters(host=config.QUEUE_BROKER_IP),
+            on_open_callback=lambda _: opened.set_result(None),
+            on_open_error_callback=lambda _, error: opened.set_exception(
+                ConnectionError(f"Failed to connect to RabbitMQ: {error}")
+            ),
+            on_close_callback=self._on_closed,
+            custom_ioloop=loop,
+        )
+        await opened
+
+        channel = loop.create_future()
+        self._connection.channel(on_open_callback=channel.set_result)
+        self._channel = await channel
+        self._channel.add_on_close_callback(self._on_closed)
+
+    async def _declare(self, queue: str):
+        declared = asyncio.get_running_loop().create_future()
+        self._channel.queue_declare(
+            queue=queue, durable=True, callback=declared.set_result
+        )
+        await declared
+
+    async def _qos(self, prefetch_count: int):
+        applied = asyncio.get_running_loop().create_future()
+        self._channel.basic_qos(
+            prefetch_count=prefetch_count, callback=applied.set_result
+        )
+        await applied
+
+    def _on_message(self, channel, method, properties, body: bytes):
+        tag = method.delivery_tag
+        self._received_at[tag % len(self._received_at)] = time.monotonic()
+        self.received += 1
+
+        self._deliveries.put_nowait((tag, properties, body))
+
+    def _on_closed(self, _, reason):
+        # Wakes up the listener, so it stops instead of waiting forever.
+        error = ConnectionError(f"RabbitMQ connection closed: {reason}")
+        self._deliveries.put_nowait(error)
+
+    @staticmethod
+    def _serialize(data: dict, content_type: str = None) -> bytes:
+        return codecs.get(content_type).encode(data)
+
+    @staticmethod
+    def _deserialize(body: bytes, content_type: str = None) -> dict:
+        return codecs.get(content_type).decode(body)
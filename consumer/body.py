@@ -1,8 +1,11 @@
 """Module "consumer"."""
 
-import json
 import pika
 import config
+from logger import logger
+from .codecs import codecs
+from .stale import StaleFilter
+from .capture import TrafficRecorder
 
 
 class Consumer(object):
@@ -11,33 +14,77 @@ class Consumer(object):
     and reciving data from RabbitMQ.
     """
 
-    connection = pika.BlockingConnection(
-        pika.ConnectionParameters(host=config.QUEUE_BROKER_IP)
-    )
-    channel = connection.channel()
+    connection = None
+    channel = None
+    stale = StaleFilter(config.EVENT_TTL)
+    recorder = TrafficRecorder(config.CAPTURE_PATH) if config.CAPTURE_PATH else None
 
     def listen_queue(self, queue: str) -> dict:
         """Listen to the queue inside RabbitMQ.
-        When receiving data, decodes and converts
-        from JSON to dcit object.
+        When receiving data, decodes it to dict object
+        with the codec matching message content type.
+        Stale messages are dropped or moved to STALE_QUEUE.
 
         Args:
             queue (str): Queue name in RabbitMQ.
 
         Yields:
-            Iterator[dict]: JSON log data.
+            Iterator[dict]: JSON event data.
         """
+        if self.channel is None:
+            self._connect()
+
         self.channel.queue_declare(queue=queue, durable=True)
 
-        for data in self.channel.consume(queue=queue, auto_ack=True):
-            decoded = self._deserialize(data[2])
+        if config.STALE_QUEUE:
+            self.channel.queue_declare(queue=config.STALE_QUEUE, durable=True)
+
+        for _, properties, body in self.channel.consume(queue=queue, auto_ack=True):
+            if self.recorder is not None:
+                self.recorder.record(properties, body)
+
+            try:
+                data = self._deserialize(body, properties.content_type)
+
+            except ValueError as error:
+                # Runs in the consumer thread, so the logger is called
+                # directly. Deliveries are acknowledged on receive.
+                logger.logger.warning(f"Dropped undecodable message: {error}")
+                continue
+
+            if not isinstance(data, dict):
+                logger.logger.warning("Dropped message: event is not an object")
+                continue
+
+            if self.stale.enabled and self.stale.is_stale(
+                self.stale.produced_at(properties, data)
+            ):
+                self._shed(properties, body)
+                continue
+
+            yield data
+
+    def _shed(self, properties, body: bytes):
+        if config.STALE_QUEUE:
+            self.channel.basic_publish(
+                exchange="",
+                routing_key=config.STALE_QUEUE,
+                body=body,
+                properties=properties,
+            )
 
-            yield json.loads(decoded)
+    def _connect(self):
+        # Connection is opened on first use, so importing the
+        # package does not block on the broker in async mode.
+        self.connection = pika.BlockingConnection(
+            pika.ConnectionParameters(host=config.QUEUE_BROKER_IP)
+        )
+        self.channel = self.connection.channel()
 
     @staticmethod
-    def _serialize(string: str) -> bytes:
-        return string.encode("utf-8")
+    def _serialize(data: dict, content_type: str = None) -> bytes:
+        return codecs.get(content_type).encode(data)
 
     @staticmethod
-    def _deserialize(byte_string: bytes) -> str:
-        return byte_string.decode("utf-8")
+    def _deserialize(body: bytes, content_type: str = None) -> dict:
+        return codecs.get(content_type).decode(body)
@@ -0,0 +1,64 @@
+"""Module "consumer"."""
+
+import json
+import time
+import base64
+
+
+class TrafficRecorder(object):
+    """Traffic capture class.
+    Appends raw deliveries to the JSONL file, one record per line:
+    receive time, content type, headers and base64 encoded body.
+    Captured files are played back with "python -m replay".
+
+    Args:
+        path (str): Path to the capture file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def record(self, properties, body: bytes):
+        """Appends the delivery to the capture file.
+
+        Args:
+            properties (BasicProperties): AMQP message properties.
+            body (bytes): Raw message body.
+        """
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+
+        record = {
+            "ts": time.time(),
+            "content_type": properties.content_type,
+            "timestamp": properties.timestamp,
+            "headers": properties.headers,
+            "body": base64.b64encode(body).decode("ascii"),
+        }
+
+        self._file.write(json.dumps(record, default=str) + "\n")
+
+    @staticmethod
+    def load(path: str) -> list:
+        """Reads records from the capture file.
+
+        Args:
+            path (str): Path to the capture file.
+
+        Returns:
+            list: Records with decoded bodies, ordered by receive time.
+        """
+        records = []
+
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+
+                record = json.loads(line)
+                record["body"] = base64.b64decode(record["body"])
+                records.append(record)
+
+        records.sort(key=lambda record: record["ts"])
+        return records
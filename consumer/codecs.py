@@ -0,0 +1,145 @@
+"""Module "consumer"."""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class JSONCodec(object):
+    """JSON message codec.
+    Parses bytes and memoryview bodies directly,
+    without decoding them to str first. Uses orjson
+    when it is installed.
+    """
+
+    CONTENT_TYPES = ("application/json",)
+
+    @staticmethod
+    def decode(body) -> dict:
+        """Converts message body to dict object.
+
+        Args:
+            body (bytes | memoryview): Message body.
+
+        Returns:
+            dict: Decoded data.
+        """
+        if orjson is not None:
+            return orjson.loads(body)
+
+        if isinstance(body, memoryview):
+            body = body.tobytes()
+
+        return json.loads(body)
+
+    @staticmethod
+    def encode(data: dict) -> bytes:
+        """Converts dict object to message body.
+
+        Args:
+            data (dict): Data to encode.
+
+        Returns:
+            bytes: Message body.
+        """
+        if orjson is not None:
+            return orjson.dumps(data)
+
+        return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+class MsgpackCodec(object):
+    """MessagePack message codec.
+    Requires msgpack package to be installed.
+    """
+
+    CONTENT_TYPES = ("application/msgpack", "application/x-msgpack")
+
+    @staticmethod
+    def decode(body) -> dict:
+        """Converts message body to dict object.
+
+        Args:
+            body (bytes | memoryview): Message body.
+
+        Returns:
+            dict: Decoded data.
+        """
+        return msgpack.unpackb(body, raw=False)
+
+    @staticmethod
+    def encode(data: dict) -> bytes:
+        """Converts dict object to message body.
+
+        Args:
+            data (dict): Data to encode.
+
+        Returns:
+            bytes: Message body.
+        """
+        return msgpack.packb(data, use_bin_type=True)
+
+
+class CodecRegistry(object):
+    """Message codecs by AMQP content type.
+    Messages without content type are
+    decoded with the default codec.
+    """
+
+    def __init__(self, default):
+        self._default = default
+        self._codecs = {}
+
+        self.register(default)
+
+    def register(self, codec):
+        """Registers codec for all of its content types.
+
+        Args:
+            codec (object): Codec with decode and encode methods.
+        """
+        for content_type in codec.CONTENT_TYPES:
+            self._codecs[content_type] = codec
+
+    def get(self, content_type: str = None):
+        """Returns codec for the content type.
+
+        Args:
+            content_type (str, optional): AMQP content type. Defaults to None.
+
+        Raises:
+            ValueError: Content type is not supported.
+
+        Returns:
+            object: Codec object.
+        """
+        if not content_type:
+            return self._default
+
+        codec = self._codecs.get(content_type)
+        if codec is not None:
+            return codec
+
+        # "application/json; charset=utf-8" -> "application/json"
+        mime = content_type.split(";", 1)[0].strip().lower().replace("\\", "/")
+        codec = self._codecs.get(mime)
+
+        if codec is None:
+            raise ValueError(f"Unsupported content type: {content_type}")
+
+        self._codecs[content_type] = codec
+        return codec
+
+
+codecs = CodecRegistry(default=JSONCodec)
+
+if msgpack is not None:
+    codecs.register(MsgpackCodec)
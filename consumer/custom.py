@@ -1,4 +1,5 @@
 from .body import Consumer
+from .aio import AsyncConsumer
 
 
 class CustomConsumer(Consumer):
@@ -11,4 +12,15 @@ class CustomConsumer(Consumer):
     # Write custom functions under this line
 
 
+class CustomAsyncConsumer(AsyncConsumer):
+    """Custom asyncio consumer class.
+    Preferences for implimentation of custom
+    functions for working with data that recived
+    from a queue inside RabbitMQ.
+    """
+
+    # Write custom functions under this line
+
+
 consumer = CustomConsumer()
+async_consumer = CustomAsyncConsumer()
@@ -0,0 +1,97 @@
+"""Module "consumer"."""
+
+import pika
+import config
+from logger import logger
+from .codecs import codecs
+
+
+class ShardRouter(object):
+    """Shard router class.
+    Moves deliveries from the source queue to per-shard
+    queues, choosing the shard by the event peer_id.
+    So events of one conversation always reach the same
+    worker process and keep their order.
+
+    Args:
+        source (str): Source queue name in RabbitMQ.
+        shards (int): Count of shard queues.
+    """
+
+    def __init__(self, source: str, shards: int):
+        self.source = source
+        self.shards = shards
+
+    @staticmethod
+    def shard_queue(source: str, index: int) -> str:
+        """Returns the name of the shard queue.
+
+        Args:
+            source (str): Source queue name in RabbitMQ.
+            index (int): Shard index.
+
+        Returns:
+            str: Shard queue name.
+        """
+        return f"{source}.shard.{index}"
+
+    def shard_index(self, properties, body: bytes) -> int:
+        """Returns the shard index for the delivery.
+        Undecodable deliveries and events without a numeric
+        peer_id go to the first shard, where the worker
+        drops them or fails to handle them.
+
+        Returns:
+            int: Shard index.
+        """
+        try:
+            event = codecs.get(properties.content_type).decode(body)
+            return int(event.get("peer_id") or 0) % self.shards
+
+        except (ValueError, TypeError, AttributeError) as error:
+            # The router is not an asyncio process, so the logger
+            # is called directly.
+            log_text = f"Malformed message routed to shard 0: {error!r}"
+            logger.logger.warning(log_text)
+
+            return 0
+
+    def run(self):
+        """Declares shard queues and routes deliveries
+        until the connection is closed.
+        """
+        connection = pika.BlockingConnection(
+            pika.ConnectionParameters(host=config.QUEUE_BROKER_IP)
+        )
+        channel = connection.channel()
+        self._declare(channel)
+
+        # A delivery is acknowledged only after the broker
+        # has confirmed it was routed to a shard queue. Blocking
+        # channel waits for every confirm, so the router moves
+        # no more than about 1 / RTT (to the broker) messages
+        # per second, whatever the count of workers.
+        channel.confirm_delivery()
+        channel.basic_qos(prefetch_count=config.PREFETCH_COUNT)
+
+        for method, properties, body in channel.consume(queue=self.source):
+            channel.basic_publish(
+                exchange=config.SHARD_EXCHANGE,
+                routing_key=str(self.shard_index(properties, body)),
+                body=body,
+                properties=properties,
+            )
+            channel.basic_ack(delivery_tag=method.delivery_tag)
+
+    def _declare(self, channel):
+        channel.queue_declare(queue=self.source, durable=True)
+        channel.exchange_declare(
+            exchange=config.SHARD_EXCHANGE, exchange_type="direct", durable=True
+        )
+
+        for index in range(self.shards):
+            queue = self.shard_queue(self.source, index)
+            channel.queue_declare(queue=queue, durable=True)
+            channel.queue_bind(
+                queue=queue, exchange=config.SHARD_EXCHANGE, routing_key=str(index)
+            )
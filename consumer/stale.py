@@ -0,0 +1,76 @@
+"""Module "consumer"."""
+
+import time
+
+
+class StaleFilter(object):
+    """Stale events filter.
+    VK expects an answer to the button click within seconds,
+    so there is no point to handle an event that waited in
+    the queue longer than the TTL.
+
+    The produced-at time is taken from the AMQP timestamp
+    property, the "x-produced-at" header or the event "ts"
+    field, in that order. Only the last one requires the
+    message body to be decoded.
+
+    Args:
+        ttl (float): Event time to live in seconds. 0 disables the filter.
+    """
+
+    HEADER = "x-produced-at"
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.expired = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def produced_at(self, properties, event: dict = None) -> float:
+        """Returns the time the event was produced at.
+
+        Args:
+            properties (BasicProperties): AMQP message properties.
+            event (dict, optional): Decoded event. Defaults to None.
+
+        Returns:
+            float: Seconds since epoch or None, if unknown
+            or can not be parsed.
+        """
+        if properties.timestamp:
+            return self._seconds(properties.timestamp)
+
+        headers = properties.headers
+        if headers and headers.get(self.HEADER) is not None:
+            return self._seconds(headers[self.HEADER])
+
+        if isinstance(event, dict) and event.get("ts") is not None:
+            return self._seconds(event["ts"])
+
+        return None
+
+    def is_stale(self, produced_at: float) -> bool:
+        """Checks the event age, counting stale events.
+
+        Args:
+            produced_at (float): Seconds since epoch or None.
+
+        Returns:
+            bool: True if the event is older than TTL.
+        """
+        if produced_at is None or time.time() - produced_at <= self.ttl:
+            return False
+
+        self.expired += 1
+        return True
+
+    @staticmethod
+    def _seconds(value) -> float:
+        # Producers may put anything there, e.g. an ISO date string.
+        try:
+            return float(value)
+
+        except (TypeError, ValueError):
+            return None
@@ -0,0 +1,116 @@
+"""Module "db"."""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from .connection import AsyncConnectionPool
+from .execute import QueryBuilder, timed
+
+
+class AsyncExecuter(object):
+    """Asyncio facade of the executer.
+    Queries run on a dedicated thread pool sized to the
+    connection pool, so the event loop is not blocked while
+    MySQL server responds and no thread waits for a connection
+    held by another one. The methods take the same arguments
+    as the ones of the wrapped executer.
+
+    Args:
+        executer (Executer): Blocking executer.
+        workers (int): Thread pool size. 0 - the executer is called
+        on the event loop, e.g. the one with in-memory tables.
+    """
+
+    def __init__(self, executer, workers: int):
+        self.executer = executer
+        self._threads = None
+
+        if workers > 0:
+            self._threads = ThreadPoolExecutor(workers, thread_name_prefix="db")
+
+    async def select(self, schema: str, table: str, fields: tuple = None, **rows):
+        return await self._run(self.executer.select, schema, table, fields, **rows)
+
+    async def insert(self, schema: str, table: str, on_duplicate=None, **rows):
+        return await self._run(
+            self.executer.insert, schema, table, on_duplicate, **rows
+        )
+
+    async def update(self, schema: str, table: str, new_data: dict, **rows):
+        return await self._run(self.executer.update, schema, table, new_data, **rows)
+
+    async def delete(self, schema: str, table: str, **rows):
+        return await self._run(self.executer.delete, schema, table, **rows)
+
+    async def raw(self, schema: str, query: str):
+        return await self._run(self.executer.raw, schema, query)
+
+    async def close(self):
+        """Waits for running queries, stops the threads
+        and closes the executer connections.
+        """
+        if self._threads is not None:
+            await asyncio.to_thread(self._threads.shutdown, wait=True)
+
+        self.executer.close()
+
+    async def _run(self, method, *args, **kwargs):
+        if self._threads is None:
+            return method(*args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._threads, functools.partial(method, *args, **kwargs)
+        )
+
+
+class AsyncMySQLExecuter(QueryBuilder):
+    """Executer on the asyncio MySQL driver (aiomysql).
+    Queries are awaited on the event loop, without a thread
+    hop per query. The methods take the same arguments as
+    the ones of Executer.
+
+    Args:
+        pool (AsyncConnectionPool): Connection pool.
+    """
+
+    def __init__(self, pool: AsyncConnectionPool):
+        self.pool = pool
+
+    @timed("select")
+    async def select(self, schema: str, table: str, fields: tuple = None, **rows):
+        return await self._execute(*self._select_query(schema, table, fields, rows))
+
+    @timed("insert")
+    async def insert(self, schema: str, table: str, on_duplicate=None, **rows):
+        if not rows:
+            return
+
+        await self._execute(*self._insert_query(schema, table, on_duplicate, rows))
+
+    @timed("update")
+    async def update(self, schema: str, table: str, new_data: dict, **rows):
+        if not new_data:
+            return
+
+        await self._execute(*self._update_query(schema, table, new_data, rows))
+
+    @timed("delete")
+    async def delete(self, schema: str, table: str, **rows):
+        await self._execute(*self._delete_query(schema, table, rows))
+
+    @timed("raw", per_table=False)
+    async def raw(self, schema: str, query: str):
+        return await self._execute(query, schema=schema)
+
+    async def close(self):
+        """Closes pool connections."""
+        await self.pool.close()
+
+    async def _execute(
+        self, query: str, params: tuple = None, schema: str = None
+    ) -> tuple:
+        async with self.pool.connection(schema) as connection:
+            async with connection.cursor() as cursor:
+                await cursor.execute(query, params)
+                return await cursor.fetchall()
@@ -1,36 +1,295 @@
 """Module "db"."""
 
-import MySQLdb
+import time
+import queue
+import asyncio
+import threading
+from weakref import WeakKeyDictionary
+from contextlib import contextmanager, asynccontextmanager
+from metrics import registry
 
+# Only the backend in use needs its driver.
+try:
+    import MySQLdb
 
-class Connection(object):
+except ImportError:
+    MySQLdb = None
+
+try:
+    import aiomysql
+
+except ImportError:
+    aiomysql = None
+
+
+WAIT_SECONDS = registry.histogram(
+    "db_pool_wait_seconds", "Time queries wait for a free MySQL connection."
+).labels()
+
+
+class PoolTimeoutError(Exception):
+    """No MySQL connection was released within the pool timeout."""
+
+
+class ConnectionPool(object):
     """
-    This class provides connection to the MySQL database.
+    This class provides a bounded pool of connections
+    to the MySQL database. Connections are opened on demand,
+    up to the pool size. A query borrows a connection
+    for its duration, so threads never share one.
+    Connections broken by MySQL errors are closed and
+    replaced by new ones.
+
+    Args:
+        size (int): Maximum count of open connections.
+        timeout (float): Seconds to wait for a free connection.
     """
 
-    def __init__(self, host: str, port: int, user: str, password: str):
-        try:
-            self._connection = MySQLdb.connect(
-                host=host, port=port, user=user, password=password
-            )
-            self._connection.autocommit(True)
-            self._cursor = self._connection.cursor()
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        size: int = 4,
+        timeout: float = 10.0,
+    ):
+        if MySQLdb is None:
+            raise RuntimeError('DB backend "mysql" requires mysqlclient package')
 
+        self._params = dict(host=host, port=port, user=user, password=password)
+        self.size = max(size, 1)
+        self.timeout = timeout
+
+        # Recently used connections first, so under light load
+        # the same few connections serve all queries.
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        # Connection -> its default schema.
+        self._schemas = WeakKeyDictionary()
+
+        # The first connection is opened right away to report
+        # MySQL server availability on start.
+        self._opened = 1
+        try:
+            self._idle.put(self._open())
             print(f"Connected to MySQL Server with <User: {user}>.")
 
         except MySQLdb.Error as error:
             print(f"Failed to connect to MySQL Server: {error}")
 
     @property
-    def cursor(self):
+    def opened(self) -> int:
         """
-        Returns database cursor object.
+        Returns count of open connections.
         """
-        return self._cursor
+        return self._opened
 
     @property
-    def connection(self):
+    def in_use(self) -> int:
         """
-        Returns database connection object.
+        Returns count of borrowed connections.
         """
-        return self._connection
+        return self._opened - self._idle.qsize()
+
+    @contextmanager
+    def connection(self, schema: str = None):
+        """Borrows a connection from the pool.
+
+        Args:
+            schema (str, optional): Default schema to switch the
+            connection to. The switch takes a round trip, so it
+            is made only if the schema changes. Defaults to None.
+
+        Raises:
+            PoolTimeoutError: No connection was released in time.
+
+        Yields:
+            Connection: MySQL connection object.
+        """
+        connection = self._acquire()
+        broken = False
+
+        try:
+            if schema is not None and self._schemas.get(connection) != schema:
+                connection.select_db(schema)
+                self._schemas[connection] = schema
+
+            yield connection
+
+        except (MySQLdb.OperationalError, MySQLdb.InterfaceError):
+            broken = True
+            raise
+
+        finally:
+            if broken:
+                self._discard(connection)
+
+            else:
+                self._idle.put(connection)
+
+    def close(self):
+        """Closes idle connections."""
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+
+            except queue.Empty:
+                return
+
+    def _acquire(self):
+        started = time.perf_counter()
+
+        try:
+            try:
+                return self._idle.get_nowait()
+
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                reserved = self._opened < self.size
+                if reserved:
+                    self._opened += 1
+
+            if reserved:
+                return self._open()
+
+            try:
+                return self._idle.get(timeout=self.timeout)
+
+            except queue.Empty:
+                raise PoolTimeoutError(
+                    f"No free MySQL connection within {self.timeout} s"
+                ) from None
+
+        finally:
+            WAIT_SECONDS.observe(time.perf_counter() - started)
+
+    def _open(self):
+        # The caller has reserved a slot for the connection.
+        try:
+            connection = MySQLdb.connect(**self._params)
+            connection.autocommit(True)
+            return connection
+
+        except BaseException:
+            with self._lock:
+                self._opened -= 1
+            raise
+
+    def _discard(self, connection):
+        with self._lock:
+            self._opened -= 1
+
+        try:
+            connection.close()
+
+        except MySQLdb.Error:
+            pass
+
+
+class AsyncConnectionPool(object):
+    """
+    This class provides a bounded pool of connections
+    to the MySQL database for the asyncio driver (aiomysql).
+    The pool is bound to the event loop, so it is created
+    on the first query.
+
+    Args:
+        size (int): Maximum count of open connections.
+        timeout (float): Seconds to wait for a free connection.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        size: int = 4,
+        timeout: float = 10.0,
+    ):
+        if aiomysql is None:
+            raise RuntimeError('DB backend "aiomysql" requires aiomysql package')
+
+        self._params = dict(host=host, port=port, user=user, password=password)
+        self.size = max(size, 1)
+        self.timeout = timeout
+
+        self._pool = None
+        self._creating = asyncio.Lock()
+        # Connection -> its default schema.
+        self._schemas = WeakKeyDictionary()
+
+    @property
+    def opened(self) -> int:
+        """
+        Returns count of open connections.
+        """
+        return self._pool.size if self._pool is not None else 0
+
+    @property
+    def in_use(self) -> int:
+        """
+        Returns count of borrowed connections.
+        """
+        if self._pool is None:
+            return 0
+
+        return self._pool.size - self._pool.freesize
+
+    @asynccontextmanager
+    async def connection(self, schema: str = None):
+        """Borrows a connection from the pool.
+
+        Args:
+            schema (str, optional): Default schema to switch the
+            connection to, only if it changes. Defaults to None.
+
+        Raises:
+            PoolTimeoutError: No connection was released in time.
+
+        Yields:
+            Connection: aiomysql connection object.
+        """
+        pool = self._pool or await self._create()
+        started = time.perf_counter()
+
+        try:
+            connection = await asyncio.wait_for(pool.acquire(), self.timeout)
+
+        except asyncio.TimeoutError:
+            raise PoolTimeoutError(
+                f"No free MySQL connection within {self.timeout} s"
+            ) from None
+
+        finally:
+            WAIT_SECONDS.observe(time.perf_counter() - started)
+
+        try:
+            if schema is not None and self._schemas.get(connection) != schema:
+                await connection.select_db(schema)
+                self._schemas[connection] = schema
+
+            yield connection
+
+        finally:
+            # Connections closed by errors are dropped by the pool.
+            pool.release(connection)
+
+    async def close(self):
+        """Closes all connections."""
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
+
+    async def _create(self):
+        async with self._creating:
+            if self._pool is None:
+                self._pool = await aiomysql.create_pool(
+                    minsize=1, maxsize=self.size, autocommit=True, **self._params
+                )
+                print(f"Connected to MySQL Server with <User: {self._params['user']}>.")
+
+        return self._pool
@@ -1,8 +1,10 @@
 """Module "db"."""
 
 import config
-from .connection import Connection
+from .aio import AsyncExecuter, AsyncMySQLExecuter
+from .connection import AsyncConnectionPool, ConnectionPool
 from .execute import Executer
+from .memory import MemoryExecuter
 
 
 class DataBase(object):
@@ -11,19 +13,67 @@ class DataBase(object):
     Organizes a connection and implements
     access to table properties using
     object-relational methods of the base table.
+
+    Backend "memory" keeps tables in memory and
+    does not connect to MySQL server at all.
+
+    Query methods of "execute" are coroutines. Backend "mysql"
+    runs queries on a thread pool, one thread per pool connection.
+    Backend "aiomysql" awaits them with the asyncio driver.
     """
 
-    def __init__(self, host: str, port: int, user: str, password: str):
-        self._tunnel = Connection(host=host, port=port, user=user, password=password)
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        backend: str = "mysql",
+        pool_size: int = 4,
+        pool_timeout: float = 10.0,
+    ):
+        if backend == "memory":
+            self._tunnel = None
+            self._execute = AsyncExecuter(MemoryExecuter(), workers=0)
+            return
+
+        if backend == "aiomysql":
+            self._tunnel = AsyncConnectionPool(
+                host=host,
+                port=port,
+                user=user,
+                password=password,
+                size=pool_size,
+                timeout=pool_timeout,
+            )
+            self._execute = AsyncMySQLExecuter(pool=self._tunnel)
+            return
+
+        self._tunnel = ConnectionPool(
+            host=host,
+            port=port,
+            user=user,
+            password=password,
+            size=pool_size,
+            timeout=pool_timeout,
+        )
 
-        self._execute = Executer(
-            connection=self._tunnel.connection, cursor=self._tunnel.cursor
+        self._execute = AsyncExecuter(
+            Executer(pool=self._tunnel), workers=self._tunnel.size
         )
 
     @property
     def execute(self):
         return self._execute
 
+    @property
+    def pool(self):
+        return self._tunnel
+
+    async def close(self):
+        """Waits for running queries and closes connections."""
+        await self._execute.close()
+
     @property
     def preset(self):
         pass
@@ -34,4 +84,7 @@ db = DataBase(
     port=config.MY_SQL_PORT,
     user=config.MY_SQL_USER,
     password=config.MY_SQL_PSWD,
+    backend=config.DB_BACKEND,
+    pool_size=config.DB_POOL_SIZE,
+    pool_timeout=config.DB_POOL_TIMEOUT,
 )
@@ -1,17 +1,222 @@
 """Module "db" """
 
+import time
+import asyncio
+from functools import lru_cache, wraps
+import config
+from metrics import registry
+from .connection import ConnectionPool
+
+QUERY_SECONDS = registry.histogram(
+    "db_query_seconds", "MySQL query latency.", ("table", "operation")
+)
+
+
+def timed(operation: str, per_table: bool = True):
+    """Observes latency of the Executer method
+    (plain or coroutine one) per table in "db_query_seconds" histogram.
+
+    Args:
+        operation (str): Operation label value.
+        per_table (bool, optional): False for methods, whose second
+        argument is not a table name. Their table label is "*".
+        Defaults to True.
+    """
 
-class Executer(object):
-    """Class providing functions
-    for basic SQL queries.
+    def decorator(method):
+        # table -> histogram, so a query does not allocate label tuples.
+        children = {}
+
+        def child(table: str):
+            key = table if per_table else "*"
+            histogram = children.get(key)
+            if histogram is None:
+                histogram = children[key] = QUERY_SECONDS.labels(key, operation)
+
+            return histogram
+
+        if asyncio.iscoroutinefunction(method):
+
+            @wraps(method)
+            async def async_wrapper(self, schema: str, table: str, *args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await method(self, schema, table, *args, **kwargs)
+
+                finally:
+                    child(table).observe(time.perf_counter() - started)
+
+            return async_wrapper
+
+        @wraps(method)
+        def wrapper(self, schema: str, table: str, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(self, schema, table, *args, **kwargs)
+
+            finally:
+                child(table).observe(time.perf_counter() - started)
+
+        return wrapper
+
+    return decorator
+
+
+class QueryBuilder(object):
+    """Base class of executers.
+    Forms SQL queries from ORM arguments: a statement
+    template and values bound to its placeholders by the
+    driver. Templates are cached by the query shape, i.e.
+    operation, table, fields and filter keys, so queries
+    differing only in values share one template.
+    Table names are qualified with the schema, so
+    a query takes a single round trip to MySQL server.
     """
 
     _ops = {"__le": "<=", "__lt": "<", "__ge": ">=", "__gt": ">", "__nt": "!="}
 
-    def __init__(self, connection, cursor):
-        self.con = connection
-        self.cur = cursor
+    def _select_query(self, schema: str, table: str, fields: tuple, rows: dict):
+        fields = tuple(fields) if fields else None
+        query = self._template("select", schema, table, fields, tuple(rows))
+
+        return query, self._params(rows.values())
+
+    def _insert_query(self, schema: str, table: str, on_duplicate: str, rows: dict):
+        query = self._template(
+            "insert", schema, table, tuple(rows), (), on_duplicate=on_duplicate
+        )
+        params = self._params(rows.values())
+
+        if on_duplicate == "update":
+            params += params
+
+        return query, params
+
+    def _update_query(self, schema: str, table: str, new_data: dict, rows: dict):
+        query = self._template("update", schema, table, tuple(new_data), tuple(rows))
+
+        return query, self._params((*new_data.values(), *rows.values()))
+
+    def _delete_query(self, schema: str, table: str, rows: dict):
+        query = self._template("delete", schema, table, None, tuple(rows))
+
+        return query, self._params(rows.values())
 
+    @staticmethod
+    def _params(values) -> tuple:
+        # Values used to be quoted into the query, so they are
+        # bound as strings to be compared and stored as before.
+        return tuple(str(value) for value in values)
+
+    @staticmethod
+    @lru_cache(maxsize=config.DB_TEMPLATE_CACHE_SIZE)
+    def _template(
+        operation: str,
+        schema: str,
+        table: str,
+        fields: tuple,
+        keys: tuple,
+        on_duplicate: str = None,
+    ) -> str:
+        """Compiles the statement template of the query shape.
+
+        Args:
+            operation (str): "select", "insert", "update" or "delete".
+            fields (tuple): Selected, inserted or updated fields.
+            keys (tuple): Filter keys, including comparison suffixes.
+            on_duplicate (str, optional): Insert conflict action.
+            Defaults to None.
+
+        Returns:
+            str: Query with %s placeholders for values.
+        """
+        target = f"{schema}.{table}"
+
+        if operation == "select":
+            query = f"SELECT {', '.join(fields) if fields else '*'} FROM {target}"
+
+        elif operation == "insert":
+            placeholders = ", ".join(["%s"] * len(fields))
+            query = (
+                f"INSERT INTO {target} ({', '.join(fields)}) VALUES ({placeholders})"
+            )
+
+            if on_duplicate == "ignore":
+                query += " ON DUPLICATE KEY UPDATE id=id"
+
+            if on_duplicate == "update":
+                assignments = ", ".join([f"{field}=%s" for field in fields])
+                query += f" ON DUPLICATE KEY UPDATE {assignments}"
+
+        elif operation == "update":
+            assignments = ", ".join([f"{field}=%s" for field in fields])
+            query = f"UPDATE {target} SET {assignments}"
+
+        else:
+            query = f"DELETE FROM {target}"
+
+        if keys:
+            query += f" WHERE {' AND '.join(QueryBuilder._get_ratio(keys))}"
+
+        return query + ";"
+
+    @staticmethod
+    def _get_ratio(keys: tuple) -> list:
+        """
+        When specifying a method for comparing variables in an ORM query method,
+        you must use keywords. Key characters are transformed by this
+        method into comparison operators. The function returns a list
+        of conditions with placeholders for values.
+
+        Args:
+            keys (tuple): Keys with transformation suffixes into comparison operators
+
+        Returns:
+            list: list of conditions with sql comparison operators.
+        """
+        summary = []
+        for key in keys:
+            op = QueryBuilder._ops.get(key[-4:], "=")
+
+            if op != "=":
+                key = key[0:-4]
+
+            summary.append(f"{key} {op} %s")
+
+        return summary
+
+
+def template_cache_info():
+    """Returns statistics of the query template cache.
+
+    Returns:
+        CacheInfo: Hits, misses, maximum and current size.
+    """
+    return QueryBuilder._template.cache_info()
+
+
+registry.counter(
+    "db_query_templates_total",
+    "Query template cache lookups.",
+    ("result",),
+    callback=lambda: {
+        "hit": template_cache_info().hits,
+        "miss": template_cache_info().misses,
+    },
+)
+
+
+class Executer(QueryBuilder):
+    """Class providing functions
+    for basic SQL queries. Every query borrows
+    its own connection and cursor from the pool,
+    so the methods may be called from several threads.
+    """
+
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+
+    @timed("select")
     def select(self, schema: str, table: str, fields: tuple = None, **rows) -> tuple:
         """
         Accepts arguments for fields, comparisons, etc.,
@@ -33,24 +238,9 @@ class Executer(object):
         Returns:
             str: MySQL query string.
         """
-        if fields:
-            summary_fields = ", ".join(fields)
-        else:
-            summary_fields = "*"
-
-        query = f"SELECT {summary_fields} FROM {table}"
-
-        if rows:
-            summary_rows = " AND ".join(self._get_ratio(rows))
-            query += f" WHERE {summary_rows}"
-
-        query += ";"
-
-        self.cur.execute(f"USE {schema};")
-        self.cur.execute(query)
-        result = self.cur.fetchall()
-        return result
+        return self._execute(*self._select_query(schema, table, fields, rows))
 
+    @timed("insert")
     def insert(self, schema: str, table: str, on_duplicate=None, **rows):
         """
         Takes arguments for fields, comparisons, etc.,
@@ -63,26 +253,9 @@ class Executer(object):
         if not rows:
             return
 
-        summary_keys = ", ".join(rows.keys())  # Might be incorrect
-        summary_values = ", ".join([f"'{value}'" for value in rows.values()])
-        query = f""" INSERT INTO {table} ({summary_keys})
-                     VALUES ({summary_values})
-                """
-
-        if on_duplicate == "ignore":
-            query += " ON DUPLICATE KEY UPDATE id=id"
-
-        if on_duplicate == "update":
-            query += f""" ON DUPLICATE KEY UPDATE {', '.join(
-                            [f"{key}='{value}'" for key, value in rows.items()]
-                        )}
-                     """
-
-        query += ";"
-
-        self.cur.execute(f"USE {schema};")
-        self.cur.execute(query)
+        self._execute(*self._insert_query(schema, table, on_duplicate, rows))
 
+    @timed("update")
     def update(self, schema: str, table: str, new_data: dict, **rows):
         """
         Accepts arguments for fields, comparisons, etc.,
@@ -105,20 +278,9 @@ class Executer(object):
         if not new_data:
             return
 
-        summary_fields = ", ".join(
-            [f"{key}='{value}'" for key, value in new_data.items()]
-        )
-        query = f"UPDATE {table} SET {summary_fields}"
-
-        if rows:
-            summary_rows = " AND ".join(self._get_ratio(rows))
-            query += f" WHERE {summary_rows}"
-
-        query += ";"
-
-        self.cur.execute(f"USE {schema};")
-        self.cur.execute(query)
+        self._execute(*self._update_query(schema, table, new_data, rows))
 
+    @timed("delete")
     def delete(self, schema: str, table: str, **rows):
         """
         Takes arguments for fields, comparisons, etc.,
@@ -135,17 +297,9 @@ class Executer(object):
         Example rows:
             id__lt=10 -> id<10
         """
-        query = f"DELETE FROM {table}"
-
-        if rows:
-            summary_rows = " AND ".join(self._get_ratio(rows))
-            query += f" WHERE {summary_rows}"
-
-        query += ";"
-
-        self.cur.execute(f"USE {schema};")
-        self.cur.execute(query)
+        self._execute(*self._delete_query(schema, table, rows))
 
+    @timed("raw", per_table=False)
     def raw(self, schema: str, query: str):
         """Raw query executer.
 
@@ -154,34 +308,34 @@ class Executer(object):
             query (str): Query string.
 
         Returns:
-            object: MySQL cursor object.
+            tuple: Fetched rows. The cursor can not be returned,
+            as its connection goes back to the pool.
         """
-        self.cur.execute(f"USE {schema};")
-        self.cur.execute(query)
+        return self._execute(query, schema=schema)
 
-        return self.cur
+    def close(self):
+        """Closes idle pool connections."""
+        self.pool.close()
 
-    def _get_ratio(self, rows: dict) -> list:
-        """
-        When specifying a method for comparing variables in an ORM query method,
-        you must use keywords. Key characters are transformed by this
-        method into comparison operators. The function returns a list
-        of strings that are arranged according to the desired pattern.
+    def _execute(self, query: str, params: tuple = None, schema: str = None) -> tuple:
+        """Runs the query on a connection borrowed from the pool.
 
         Args:
-            rows (dict): rows with transformation keys into comparison operators
+            query (str): Query string.
+            params (tuple, optional): Values bound to the query
+            placeholders. Defaults to None.
+            schema (str, optional): Default schema the query needs,
+            e.g. for unqualified table names. Defaults to None.
 
         Returns:
-            list: list of args with sql somprassion operators.
+            tuple: Fetched rows.
         """
-        summary = []
-        for key, value in rows.items():
-            op = key[-4:-1] + key[-1]
-            op = self._ops.get(op, "=")
+        with self.pool.connection(schema) as connection:
+            cursor = connection.cursor()
 
-            if op != "=":
-                key = key[0:-4]
+            try:
+                cursor.execute(query, params)
+                return cursor.fetchall()
 
-            summary.append(f"{key} {op} '{value}'")
-
-        return summary
+            finally:
+                cursor.close()
@@ -0,0 +1,102 @@
+"""Module "db"."""
+
+import operator
+from collections import defaultdict
+
+
+class MemoryExecuter(object):
+    """In-memory stand-in for the Executer class.
+    Used by the replay harness and benchmarks, when
+    the service must run without MySQL server.
+
+    Tables are lists of dict rows. A row matches the query
+    when every compared field present in the row satisfies
+    the comparison. Fields missing in the row match anything,
+    so a seeded row without conv_id serves every conversation.
+    """
+
+    _ops = {
+        "__le": operator.le,
+        "__lt": operator.lt,
+        "__ge": operator.ge,
+        "__gt": operator.gt,
+        "__nt": operator.ne,
+    }
+
+    def __init__(self, tables: dict = None):
+        # "schema.table" -> list of rows
+        self.tables = defaultdict(list)
+        self.queries = 0
+
+        for name, rows in (tables or {}).items():
+            self.tables[name].extend(dict(row) for row in rows)
+
+    def select(self, schema: str, table: str, fields: tuple = None, **rows) -> tuple:
+        self.queries += 1
+        result = []
+
+        for row in self._match(schema, table, rows):
+            keys = fields or tuple(row.keys())
+            result.append(tuple(row.get(key) for key in keys))
+
+        return tuple(result)
+
+    def insert(self, schema: str, table: str, on_duplicate=None, **rows):
+        self.queries += 1
+
+        if not rows:
+            return
+
+        self.tables[f"{schema}.{table}"].append(dict(rows))
+
+    def update(self, schema: str, table: str, new_data: dict, **rows):
+        self.queries += 1
+
+        if not new_data:
+            return
+
+        for row in self._match(schema, table, rows):
+            row.update(new_data)
+
+    def delete(self, schema: str, table: str, **rows):
+        self.queries += 1
+
+        matched = {id(row) for row in self._match(schema, table, rows)}
+        self.tables[f"{schema}.{table}"] = [
+            row for row in self.tables[f"{schema}.{table}"] if id(row) not in matched
+        ]
+
+    def raw(self, schema: str, query: str):
+        self.queries += 1
+
+    def close(self):
+        pass
+
+    def _match(self, schema: str, table: str, rows: dict) -> list:
+        matched = []
+
+        for row in self.tables[f"{schema}.{table}"]:
+            if all(self._compare(row, key, value) for key, value in rows.items()):
+                matched.append(row)
+
+        return matched
+
+    def _compare(self, row: dict, key: str, value) -> bool:
+        compare = self._ops.get(key[-4:])
+
+        if compare is None:
+            compare = operator.eq
+
+        else:
+            key = key[:-4]
+
+        if key not in row:
+            return True
+
+        # MySQL compares quoted values, so do both sides as strings
+        # unless both of them are numbers.
+        try:
+            return compare(float(row[key]), float(value))
+
+        except (TypeError, ValueError):
+            return compare(str(row[key]), str(value))
@@ -0,0 +1,11 @@
+"""Module "dispatcher".
+About:
+    The module provides a dispatcher class
+    to handle button events concurrently,
+    keeping events of one conversation
+    strictly in order.
+"""
+
+from .dispatcher import Dispatcher, received_at
+
+__all__ = ("Dispatcher", "received_at")
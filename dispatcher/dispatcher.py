@@ -0,0 +1,119 @@
+"""Module "dispatcher"."""
+
+import time
+import zlib
+import asyncio
+from contextvars import ContextVar
+from typing import Callable, Awaitable
+from logger import logger
+
+# Monotonic time the handled event was submitted at. Events may wait
+# in a shard queue, so time checks (e.g. of repeated clicks) have to
+# use it instead of the current time.
+received_at: ContextVar[float] = ContextVar("received_at")
+
+
+class Dispatcher(object):
+    """Concurrent event dispatcher.
+    Events are sharded by peer_id, and each shard is
+    served by a single worker. So events of one conversation
+    (and therefore of one menu message) are handled strictly
+    one after another, while different conversations are
+    handled concurrently, up to the count of shards.
+
+    Args:
+        handler (Callable): Coroutine function handling an event.
+        concurrency (int): Count of shards (and workers).
+        queue_size (int): Maximum count of queued events in all shards.
+        Once it is reached, submit() waits for any event to be handled.
+        A busy conversation does not hold back the others, until it
+        takes the whole queue.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[dict], Awaitable[bool]],
+        concurrency: int,
+        queue_size: int,
+    ):
+        self._handler = handler
+        self._shards = [asyncio.Queue() for _ in range(concurrency)]
+        self._slots = asyncio.Semaphore(max(queue_size, 1))
+        self._workers = []
+
+        self.in_flight = 0
+        self.handled = 0
+        self.failed = 0
+
+    @property
+    def queue_depth(self) -> list:
+        """Returns the count of queued events
+        for each shard.
+
+        Returns:
+            list: Queue depth by shard index.
+        """
+        return [shard.qsize() for shard in self._shards]
+
+    def start(self):
+        """Starts shard workers on the running event loop."""
+        for shard in self._shards:
+            self._workers.append(asyncio.create_task(self._work(shard)))
+
+    async def stop(self):
+        """Waits for queued events and stops shard workers."""
+        for shard in self._shards:
+            await shard.join()
+
+        for worker in self._workers:
+            worker.cancel()
+
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+
+    async def submit(self, event: dict, callback: Callable[[], None] = None):
+        """Puts event into its conversation shard.
+
+        Args:
+            event (dict): Button event.
+            callback (Callable, optional): Called once the event is handled,
+            whether successfully or not. Defaults to None.
+        """
+        await self._slots.acquire()
+
+        shard = self._shards[self._shard_index(event)]
+        shard.put_nowait((event, callback, time.monotonic()))
+
+    def _shard_index(self, event: dict) -> int:
+        # hash() of int is the int itself, and the shard router picks
+        # the worker process by peer_id modulo the worker count. So a
+        # worker would only use shards congruent to its own index.
+        peer_id = event.get("peer_id") or 0
+        return zlib.crc32(str(peer_id).encode()) % len(self._shards)
+
+    async def _work(self, shard: asyncio.Queue):
+        while True:
+            event, callback, submitted_at = await shard.get()
+            received_at.set(submitted_at)
+            self.in_flight += 1
+
+            try:
+                await self._handler(event)
+                self.handled += 1
+
+            except Exception as error:
+                # Worker has to survive, otherwise the whole shard stalls.
+                self.failed += 1
+                log_text = (
+                    f"Event <{event.get('event_id')}> failed with "
+                    f"{type(error).__name__}: {error}"
+                )
+                await logger.error(log_text)
+
+            finally:
+                self.in_flight -= 1
+                shard.task_done()
+                self._slots.release()
+
+            if callback is not None:
+                callback()
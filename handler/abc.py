@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from vk_api import VkApi
+from vk import AsyncVkApi
 from logger import logger
 import config
 
@@ -20,11 +20,12 @@ class ABCHandler(ABC):
             False - if event triggered something, it means event achieved goal
     """
 
-    def __init__(self):
-        # VK api object
-        self.__api: VkApi = (
-            VkApi(token=config.TOKEN, api_version=config.API_VERSION).get_api() or None
-        )
+    def __init__(self, api=None):
+        # VK api object. Replay harness passes its own stub.
+        if api is None:
+            api = AsyncVkApi(token=config.TOKEN, api_version=config.API_VERSION)
+
+        self.__api: AsyncVkApi = api or None
 
     async def __call__(self, event: dict, **kwargs) -> bool:
         """Calls the class as a function,
@@ -62,6 +63,6 @@ class ABCHandler(ABC):
         """Returns the VKontakte API object from the parent class.
 
         Returns:
-            VkApi: vk api object.
+            AsyncVkApi: vk api object.
         """
         return self.__api
@@ -1,3 +1,5 @@
+import config
+from vk import UserCache
 from .actions import (
     NotMessageOwnerAction,
     CancelAction,
@@ -42,4 +44,19 @@ action_list = {
 }
 
 
-__all__ = ("action_list",)
+def bind_actions(api) -> dict:
+    """Creates action singletons bound to the VK API object.
+    Actions keep no per-event state, so one instance of each
+    serves every event. All of them share one user names cache.
+
+    Args:
+        api (AsyncVkApi): VK API object.
+
+    Returns:
+        dict: Action instances by action name.
+    """
+    users = UserCache(api, ttl=config.USER_CACHE_TTL, size=config.USER_CACHE_SIZE)
+    return {name: action(api, users) for name, action in action_list.items()}
+
+
+__all__ = ("action_list", "bind_actions")
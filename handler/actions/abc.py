@@ -8,7 +8,7 @@ class ABCHandler(ABC):
 
     Args:
         event (BaseEvent): Modified VKBotLongpoll event.
-        api (VkApi): VK API object.
+        api (AsyncVkApi): VK API object.
 
     Returns:
         bool: Handling status.
@@ -23,7 +23,7 @@ class ABCHandler(ABC):
 
         Args:
             event (BaseEvent): Modified VKBotLongpoll event.
-            api (VkApi): VK API object.
+            api (AsyncVkApi): VK API object.
 
         Returns:
             bool: Handling status. Returns True if was handled.
@@ -3,6 +3,7 @@ from tools.keyboards import Keyboard, Callback, ButtonColor
 from db import db
 import config
 from .base import BaseAction
+from .render import render_cache
 
 
 # ------------------------------------------------------------------------
@@ -12,7 +13,7 @@ class NotMessageOwnerAction(BaseAction):
     async def _handle(self, event: dict, kwargs) -> bool:
         snackbar_message = "⚠️ Отказано в доступе."
 
-        self.snackbar(event, snackbar_message)
+        await self.snackbar(event, snackbar_message)
 
         return False
 
@@ -23,19 +24,22 @@ class CancelAction(BaseAction):
     NAME = "cancel_command"
 
     async def _handle(self, event: dict, kwargs) -> bool:
-        self.api.messages.delete(
-            peer_id=event.get("peer_id"), cmids=event.get("cmid"), delete_for_all=1
-        )
-
         snackbar_message = "❗Отмена команды. "
 
-        self.snackbar(event, snackbar_message)
-        self._close_session(event)
+        render_cache.invalidate((event.get("peer_id"), event.get("cmid")))
+
+        await self.effects(
+            self.api.messages.delete(
+                peer_id=event.get("peer_id"), cmids=event.get("cmid"), delete_for_all=1
+            ),
+            self.snackbar(event, snackbar_message),
+            self._close_session(event),
+        )
 
         return True
 
-    def _close_session(self, event):
-        db.execute.delete(
+    async def _close_session(self, event):
+        await db.execute.delete(
             schema="toaster",
             table="menu_sessions",
             conv_id=event.get("peer_id"),
@@ -46,10 +50,11 @@ class CancelAction(BaseAction):
 # ------------------------------------------------------------------------
 class MarkAction(BaseAction):
     NAME = "set_mark"
+    REQUIRED = ("mark",)
 
     async def _handle(self, event: dict, kwargs) -> bool:
         fields = ("conv_mark",)
-        mark = db.execute.select(
+        mark = await db.execute.select(
             schema="toaster",
             table="conversations",
             fields=fields,
@@ -61,7 +66,7 @@ class MarkAction(BaseAction):
         mark = payload.get("mark")
 
         if not already_marked:
-            db.execute.insert(
+            await db.execute.insert(
                 schema="toaster",
                 table="conversations",
                 conv_id=event.get("peer_id"),
@@ -74,7 +79,7 @@ class MarkAction(BaseAction):
         else:
             snackbar_message = f'❗Беседа уже имеет метку "{mark}".'
 
-        self.snackbar(event, snackbar_message)
+        await self.snackbar(event, snackbar_message)
 
         return True
 
@@ -84,7 +89,7 @@ class UpdateConvDataAction(BaseAction):
 
     async def _handle(self, event: dict, kwargs) -> bool:
         fields = ("conv_mark",)
-        mark = db.execute.select(
+        mark = await db.execute.select(
             schema="toaster",
             table="conversations",
             fields=fields,
@@ -96,7 +101,7 @@ class UpdateConvDataAction(BaseAction):
             new_data = {
                 "conv_name": event.get("peer_name"),
             }
-            db.execute.update(
+            await db.execute.update(
                 schema="toaster",
                 table="conversations",
                 new_data=new_data,
@@ -108,7 +113,7 @@ class UpdateConvDataAction(BaseAction):
         else:
             snackbar_message = "❗Беседа еще не имеет метку."
 
-        self.snackbar(event, snackbar_message)
+        await self.snackbar(event, snackbar_message)
 
         return True
 
@@ -118,7 +123,7 @@ class DropMarkAction(BaseAction):
 
     async def _handle(self, event: dict, kwargs) -> bool:
         fields = ("conv_mark",)
-        mark = db.execute.select(
+        mark = await db.execute.select(
             schema="toaster",
             table="conversations",
             fields=fields,
@@ -127,8 +132,10 @@ class DropMarkAction(BaseAction):
         already_marked = bool(mark)
 
         if already_marked:
-            db.execute.delete(
-                schema="toaster", table="conversations", conv_id=event.get("peer_id")
+            await db.execute.delete(
+                schema="toaster",
+                table="conversations",
+                conv_id=event.get("peer_id"),
             )
 
             snackbar_message = f'📝 Метка "{mark[0][0]}" снята с беседы.'
@@ -136,7 +143,7 @@ class DropMarkAction(BaseAction):
         else:
             snackbar_message = "❗Беседа еще не имеет метку."
 
-        self.snackbar(event, snackbar_message)
+        await self.snackbar(event, snackbar_message)
 
         return True
 
@@ -144,11 +151,12 @@ class DropMarkAction(BaseAction):
 # ------------------------------------------------------------------------
 class SetPermissionAction(BaseAction):
     NAME = "set_permission"
+    REQUIRED = ("target", "permission")
 
     async def _handle(self, event: dict, kwargs) -> bool:
         fields = ("user_permission",)
         target_id = event["payload"].get("target")
-        lvl = db.execute.select(
+        lvl = await db.execute.select(
             schema="toaster",
             table="permissions",
             fields=fields,
@@ -162,28 +170,31 @@ class SetPermissionAction(BaseAction):
         if already_promoted:
             if user_lvl == int(lvl[0][0]):
                 snackbar_message = f'❗Пользователь уже имеет роль "{role}".'
-                self.snackbar(event, snackbar_message)
+                await self.snackbar(event, snackbar_message)
                 return False
 
             if user_lvl == 0:
-                db.execute.delete(
-                    schema="toaster", table="permissions", user_id=target_id
+                snackbar_message = f'⚒️ Пользователю назначена роль "{role}".'
+                await db.execute.delete(
+                    schema="toaster",
+                    table="permissions",
+                    user_id=target_id,
                 )
 
-                snackbar_message = f'⚒️ Пользователю назначена роль "{role}".'
-                self.snackbar(event, snackbar_message)
+                await self.snackbar(event, snackbar_message)
+
                 return True
 
         if user_lvl == 0:
             snackbar_message = f'❗Пользователь уже имеет роль "{role}".'
-            self.snackbar(event, snackbar_message)
+            await self.snackbar(event, snackbar_message)
             return False
 
         snackbar_message = f'⚒️ Пользователю назначена роль "{role}".'
 
-        user_name = self.get_name(target_id)
+        user_name = await self.get_name(target_id)
 
-        db.execute.insert(
+        await db.execute.insert(
             schema="toaster",
             table="permissions",
             on_duplicate="update",
@@ -193,11 +204,11 @@ class SetPermissionAction(BaseAction):
             user_permission=user_lvl,
         )
 
-        self.snackbar(event, snackbar_message)
+        await self.snackbar(event, snackbar_message)
 
         return True
 
-    def get_name(self, user_id: int) -> str:
+    async def get_name(self, user_id: int) -> str:
         """Returns the full name of the user,
         using its unique ID.
 
@@ -207,24 +218,17 @@ class SetPermissionAction(BaseAction):
         Returns:
             str: User full name.
         """
-        name = self.api.users.get(user_ids=user_id)
-
-        if not bool(name):
-            name = "Unknown"
-
-        else:
-            name = name[0].get("first_name") + " " + name[0].get("last_name")
-
-        return name
+        return await self.users.get_name(user_id)
 
 
 class DropPermissionAction(BaseAction):
     NAME = "drop_permission"
+    REQUIRED = ("target",)
 
     async def _handle(self, event: dict, kwargs) -> bool:
         fields = ("user_permission",)
         target_id = event["payload"].get("target")
-        lvl = db.execute.select(
+        lvl = await db.execute.select(
             schema="toaster", table="permissions", fields=fields, user_id=target_id
         )
         already_promoted = bool(lvl)
@@ -237,13 +241,17 @@ class DropPermissionAction(BaseAction):
             role = config.PERMISSIONS_DECODING[lvl]
             snackbar_message = f'❗Пользователь уже имеет роль "{role}".'
 
-            self.snackbar(event, snackbar_message)
+            await self.snackbar(event, snackbar_message)
 
             return False
 
-        db.execute.delete(schema="toaster", table="permissions", user_id=target_id)
+        await db.execute.delete(
+            schema="toaster",
+            table="permissions",
+            user_id=target_id,
+        )
 
-        self.snackbar(event, snackbar_message)
+        await self.snackbar(event, snackbar_message)
 
         return True
 
@@ -270,16 +278,12 @@ class GameRollAction(BaseAction):
             )
         )
 
-        self.api.messages.edit(
-            peer_id=event.get("peer_id"),
-            conversation_message_id=event.get("cmid"),
-            message=new_msg_text,
-            keyboard=keyboard.json,
-        )
-
         snackbar_message = "🎲 Рулетка прокручена!"
 
-        self.snackbar(event, snackbar_message)
+        await self.effects(
+            self.edit_menu(event, new_msg_text, keyboard),
+            self.snackbar(event, snackbar_message),
+        )
 
         return True
 
@@ -313,16 +317,12 @@ class GameCoinflipAction(BaseAction):
             )
         )
 
-        self.api.messages.edit(
-            peer_id=event.get("peer_id"),
-            conversation_message_id=event.get("cmid"),
-            message=new_msg_text,
-            keyboard=keyboard.json,
-        )
-
         snackbar_message = "🎲 Монета брошена!"
 
-        self.snackbar(event, snackbar_message)
+        await self.effects(
+            self.edit_menu(event, new_msg_text, keyboard),
+            self.snackbar(event, snackbar_message),
+        )
 
         return True
 
@@ -337,7 +337,7 @@ class SystemsSettingsAction(BaseAction):
     async def _handle(self, event: dict, kwargs) -> bool:
         payload = event["payload"]
 
-        systems = db.execute.select(
+        systems = await db.execute.select(
             schema="toaster_settings",
             table="settings",
             fields=("setting_name", "setting_status"),
@@ -356,7 +356,7 @@ class SystemsSettingsAction(BaseAction):
             new_status = abs(sys_status[sys_name] - 1)  # (0 to 1) or (1 to 0)
             sys_status[sys_name] = new_status
             snackbar_message = f"⚠️ Система {'Включена' if new_status else 'Выключена'}."
-            db.execute.update(
+            await db.execute.update(
                 schema="toaster_settings",
                 table="settings",
                 new_data={"setting_status": new_status},
@@ -487,15 +487,11 @@ class SystemsSettingsAction(BaseAction):
             )
 
         new_msg_text = "⚙️ Включение\\Выключение систем модерации:"
-        self.api.messages.edit(
-            peer_id=event.get("peer_id"),
-            conversation_message_id=event.get("cmid"),
-            message=new_msg_text,
-            keyboard=keyboard.json,
+        await self.effects(
+            self.edit_menu(event, new_msg_text, keyboard),
+            self.snackbar(event, snackbar_message),
         )
 
-        self.snackbar(event, snackbar_message)
-
         return True
 
 
@@ -505,7 +501,7 @@ class FiltersSettingsAction(BaseAction):
     async def _handle(self, event: dict, kwargs) -> bool:
         payload = event["payload"]
 
-        systems = db.execute.select(
+        systems = await db.execute.select(
             schema="toaster_settings",
             table="settings",
             fields=("setting_name", "setting_status"),
@@ -526,7 +522,7 @@ class FiltersSettingsAction(BaseAction):
             snackbar_message = (
                 f"⚠️ Фильтр {'Включен' if not new_status else 'Выключен'}."
             )
-            db.execute.update(
+            await db.execute.update(
                 schema="toaster_settings",
                 table="settings",
                 new_data={"setting_status": new_status},
@@ -815,27 +811,24 @@ class FiltersSettingsAction(BaseAction):
             )
 
         new_msg_text = "⚙️ Включение\\Выключение фильтров сообщений:"
-        self.api.messages.edit(
-            peer_id=event.get("peer_id"),
-            conversation_message_id=event.get("cmid"),
-            message=new_msg_text,
-            keyboard=keyboard.json,
+        await self.effects(
+            self.edit_menu(event, new_msg_text, keyboard),
+            self.snackbar(event, snackbar_message),
         )
 
-        self.snackbar(event, snackbar_message)
-
         return True
 
 
 # ------------------------------------------------------------------------
 class ChangeDelayAction(BaseAction):
     NAME = "change_delay"
+    REQUIRED = ("setting",)
 
     async def _handle(self, event: dict, kwargs) -> bool:
         payload = event["payload"]
         setting = payload.get("setting")
 
-        delay = db.execute.select(
+        delay = await db.execute.select(
             schema="toaster_settings",
             table="delay",
             fields=("delay",),
@@ -857,7 +850,7 @@ class ChangeDelayAction(BaseAction):
                 delay = delay + time
                 snackbar_message = "⚠️ Время увеличено."
 
-            db.execute.update(
+            await db.execute.update(
                 schema="toaster_settings",
                 table="delay",
                 new_data={"delay": delay},
@@ -963,15 +956,11 @@ class ChangeDelayAction(BaseAction):
                 f"{delay} {self._get_day_declension(delay)}."
             )
 
-        self.api.messages.edit(
-            peer_id=event.get("peer_id"),
-            conversation_message_id=event.get("cmid"),
-            message=new_msg_text,
-            keyboard=keyboard.json,
+        await self.effects(
+            self.edit_menu(event, new_msg_text, keyboard),
+            self.snackbar(event, snackbar_message),
         )
 
-        self.snackbar(event, snackbar_message)
-
         return True
 
     @staticmethod
@@ -1126,15 +1115,11 @@ class SystemsPunishmentAction(BaseAction):
             )
 
         new_msg_text = "⚙️ Выберете необходимую систему:"
-        self.api.messages.edit(
-            peer_id=event.get("peer_id"),
-            conversation_message_id=event.get("cmid"),
-            message=new_msg_text,
-            keyboard=keyboard.json,
+        await self.effects(
+            self.edit_menu(event, new_msg_text, keyboard),
+            self.snackbar(event, snackbar_message),
         )
 
-        self.snackbar(event, snackbar_message)
-
         return True
 
 
@@ -1410,26 +1395,23 @@ class FiltersPunishmentAction(BaseAction):
             )
 
         new_msg_text = "⚙️ Выберете необходимый фильтр:"
-        self.api.messages.edit(
-            peer_id=event.get("peer_id"),
-            conversation_message_id=event.get("cmid"),
-            message=new_msg_text,
-            keyboard=keyboard.json,
+        await self.effects(
+            self.edit_menu(event, new_msg_text, keyboard),
+            self.snackbar(event, snackbar_message),
         )
 
-        self.snackbar(event, snackbar_message)
-
         return True
 
 
 class ChangePunishmentAction(BaseAction):
     NAME = "change_punishment"
+    REQUIRED = ("setting_name",)
 
     async def _handle(self, event: dict, kwargs) -> bool:
         payload = event["payload"]
         setting = payload.get("setting_name")
 
-        warns = db.execute.select(
+        warns = await db.execute.select(
             schema="toaster_settings",
             table="settings",
             fields=("warn_point",),
@@ -1451,7 +1433,7 @@ class ChangePunishmentAction(BaseAction):
                 warns = (warns + points) if (warns + points) <= 10 else 10
                 snackbar_message = "⚠️ Наказание увеличено."
 
-            db.execute.update(
+            await db.execute.update(
                 schema="toaster_settings",
                 table="settings",
                 new_data={"warn_point": warns},
@@ -1528,15 +1510,11 @@ class ChangePunishmentAction(BaseAction):
             f"{warns} {self._get_warn_declension(warns)}."
         )
 
-        self.api.messages.edit(
-            peer_id=event.get("peer_id"),
-            conversation_message_id=event.get("cmid"),
-            message=new_msg_text,
-            keyboard=keyboard.json,
+        await self.effects(
+            self.edit_menu(event, new_msg_text, keyboard),
+            self.snackbar(event, snackbar_message),
         )
 
-        self.snackbar(event, snackbar_message)
-
         return True
 
     @staticmethod
@@ -1,26 +1,134 @@
-from vk_api import VkApi
-from tools.keyboards import SnackbarAnswer
+import asyncio
+from typing import Awaitable
+from vk import AsyncVkApi, UserCache
+import config
+from tools.keyboards import Keyboard, SnackbarAnswer
 from .abc import ABCHandler
+from .render import render_cache
+
+
+class EffectsError(Exception):
+    """Several effects of the action failed.
+
+    Args:
+        action (str): Action name.
+        errors (list): Exceptions raised by the effects.
+    """
+
+    def __init__(self, action: str, errors: list):
+        self.errors = errors
+
+        summary = "; ".join(repr(error) for error in errors)
+        super().__init__(f'{len(errors)} effects of "{action}" failed: {summary}')
 
 
 class BaseAction(ABCHandler):
     """Command handler base class."""
 
     NAME = "None"
+    # Payload keys the action can not work without.
+    REQUIRED = ()
+    # Middleware names, outermost first. None - default chain.
+    MIDDLEWARES = None
 
-    def __init__(self, api: VkApi):
+    def __init__(self, api: AsyncVkApi, users: UserCache = None):
         self.api = api
+        # User names cache, shared by actions bound together.
+        if users is None:
+            users = UserCache(
+                api, ttl=config.USER_CACHE_TTL, size=config.USER_CACHE_SIZE
+            )
+
+        self.users = users
+        self._required = frozenset(self.REQUIRED)
 
-    def snackbar(self, event: dict, text: str):
-        """Sends a snackbar to the user.
+    def validate(self, payload: dict) -> bool:
+        """Checks that the payload has all required keys.
+
+        Args:
+            payload (dict): Button payload.
+
+        Returns:
+            bool: True if payload is valid.
+        """
+        return payload.keys() >= self._required
+
+    def snackbar(self, event: dict, text: str) -> Awaitable:
+        """Sends a snackbar to the user. The call is made
+        right away, so it joins VK calls collected for the event.
 
         Args:
             event (ButtonEvent): VK button_pressed custom event.
             text (str): Sncakbar text.
+
+        Returns:
+            Awaitable: Call result.
         """
-        self.api.messages.sendMessageEventAnswer(
+        return self.api.messages.sendMessageEventAnswer(
             event_id=event.get("button_event_id"),
             user_id=event.get("user_id"),
             peer_id=event.get("peer_id"),
             event_data=SnackbarAnswer(text).data,
         )
+
+    def edit_menu(self, event: dict, text: str, keyboard: Keyboard) -> Awaitable:
+        """Edits the menu message, unless it already shows
+        the same text and keyboard. Like snackbar(), the call
+        is made right away.
+
+        Args:
+            event (ButtonEvent): VK button_pressed custom event.
+            text (str): New message text.
+            keyboard (Keyboard): New message keyboard.
+
+        Returns:
+            Awaitable: Call result.
+        """
+        key = (event.get("peer_id"), event.get("cmid"))
+        markup = keyboard.json
+
+        if not render_cache.changed(key, text, markup):
+            skipped = asyncio.get_running_loop().create_future()
+            skipped.set_result(1)
+            return skipped
+
+        edited = asyncio.ensure_future(
+            self.api.messages.edit(
+                peer_id=event.get("peer_id"),
+                conversation_message_id=event.get("cmid"),
+                message=text,
+                keyboard=markup,
+            )
+        )
+
+        # Unknown render is shown after a failed edit.
+        def forget(future: asyncio.Future):
+            if future.cancelled() or future.exception() is not None:
+                render_cache.invalidate(key)
+
+        edited.add_done_callback(forget)
+        return edited
+
+    async def effects(self, *effects: Awaitable) -> list:
+        """Waits for independent effects of the action (VK calls,
+        DB writes) running at once. Every effect is waited for,
+        even if some of them fail. A DB write, the shown menu
+        state depends on, is awaited before, not passed here.
+
+        Raises:
+            Exception: The error of the failed effect.
+            EffectsError: Several effects failed.
+
+        Returns:
+            list: Effect results in the same order.
+        """
+        results = await asyncio.gather(*effects, return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+
+        if len(errors) == 1:
+            raise errors[0]
+
+        if errors:
+            raise EffectsError(self.NAME, errors) from errors[0]
+
+        return results
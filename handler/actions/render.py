@@ -0,0 +1,65 @@
+from collections import OrderedDict
+from metrics import registry
+import config
+
+RENDERS = registry.counter(
+    "button_menu_renders_total", "Menu renders by actions.", ("result",)
+)
+
+
+class RenderCache(object):
+    """Fingerprints of menus shown to users.
+    Keeps a hash of the last text and keyboard sent to each
+    menu message, so an unchanged render does not call
+    messages.edit again.
+
+    Args:
+        size (int): Maximum count of remembered messages.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+
+        # (peer_id, cmid) -> render hash, recently used last.
+        self._renders = OrderedDict()
+        self._edited = RENDERS.labels("edited")
+        self._skipped = RENDERS.labels("skipped")
+
+    def changed(self, key: tuple, text: str, keyboard: str) -> bool:
+        """Checks if the render differs from the shown one,
+        remembering it as shown otherwise.
+
+        Args:
+            key (tuple): (peer_id, cmid) of the menu message.
+            text (str): Message text.
+            keyboard (str): Keyboard JSON.
+
+        Returns:
+            bool: True if the message has to be edited.
+        """
+        fingerprint = hash((text, keyboard))
+
+        if self._renders.get(key) == fingerprint:
+            self._renders.move_to_end(key)
+            self._skipped.inc()
+            return False
+
+        self._renders[key] = fingerprint
+        self._renders.move_to_end(key)
+
+        while len(self._renders) > self.size:
+            self._renders.popitem(last=False)
+
+        self._edited.inc()
+        return True
+
+    def invalidate(self, key: tuple):
+        """Forgets the message, e.g. deleted or failed to edit.
+
+        Args:
+            key (tuple): (peer_id, cmid) of the menu message.
+        """
+        self._renders.pop(key, None)
+
+
+render_cache = RenderCache(size=config.RENDER_CACHE_SIZE)
@@ -0,0 +1,74 @@
+import json
+import time
+from collections import OrderedDict
+
+
+class DedupWindow(object):
+    """Duplicate events filter.
+    Remembers events for a short time window and reports
+    repeated ones: the same event_id (redelivery) or the same
+    click, i.e. the same (user_id, cmid, payload).
+
+    Args:
+        window (float): Time window in seconds. 0 disables the filter.
+        size (int): Maximum count of remembered keys.
+    """
+
+    def __init__(self, window: float, size: int):
+        self.window = window
+        self.size = size
+        self.suppressed = 0
+
+        # Key -> monotonic time it was seen at, oldest first.
+        self._seen = OrderedDict()
+
+    def is_duplicate(self, event: dict, received_at: float = None) -> bool:
+        """Checks if the event was already seen within
+        the time window, remembering it otherwise.
+
+        Args:
+            event (dict): Button event.
+            received_at (float, optional): Monotonic time the event
+            was received at. Defaults to None - the current time.
+
+        Returns:
+            bool: True if the event is a duplicate.
+        """
+        if self.window <= 0:
+            return False
+
+        now = time.monotonic() if received_at is None else received_at
+        self._expire(now)
+
+        keys = [
+            (
+                "click",
+                event.get("user_id"),
+                event.get("cmid"),
+                json.dumps(event.get("payload"), sort_keys=True),
+            )
+        ]
+
+        if event.get("event_id") is not None:
+            keys.append(("event", event["event_id"]))
+
+        if any(key in self._seen for key in keys):
+            self.suppressed += 1
+            return True
+
+        for key in keys:
+            self._seen[key] = now
+
+        while len(self._seen) > self.size:
+            self._seen.popitem(last=False)
+
+        return False
+
+    def _expire(self, now: float):
+        while self._seen:
+            key, seen_at = next(iter(self._seen.items()))
+
+            if now - seen_at <= self.window:
+                return
+
+            del self._seen[key]
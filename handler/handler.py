@@ -1,14 +1,34 @@
+from contextlib import nullcontext
+import config
 from logger import logger
+from vk import collecting
 from .abc import ABCHandler
-from .actions import action_list
+from .actions import bind_actions
+from .middleware import build_middlewares
+from .pipeline import Pipeline
 
 
 class ButtonHandler(ABCHandler):
     """Event handler class that recognizes commands
     in the message and executing attached to each command
     actions.
+
+    Only the keyboard owner may use its buttons, other users
+    get the "access denied" action. Every action is called
+    through its own middleware pipeline.
+    Action MIDDLEWARES attribute overrides the default
+    MIDDLEWARES chain from config. With VK_EXECUTE, VK calls
+    of an action are collected into "execute" batches.
     """
 
+    def __init__(self, api=None):
+        super().__init__(api)
+        self.actions = bind_actions(self.api)
+        self.middlewares = build_middlewares()
+        self.pipelines = {
+            name: self._build_pipeline(action) for name, action in self.actions.items()
+        }
+
     async def _handle(self, event: dict, kwargs) -> bool:
         if not bool(event.get("payload")):
             log_text = f"Missing payload <{event.get('event_id')}>"
@@ -19,27 +39,35 @@ class ButtonHandler(ABCHandler):
         payload = event.get("payload")
         call_action = payload.get("call_action")
 
-        kbd_owner = await self.__get_kbdowner(event)
+        # Not configurable: only the menu owner may use its buttons.
+        if event.get("user_id") != payload.get("keyboard_owner"):
+            call_action = "not_msg_owner"
 
-        if event.get("user_id") == kbd_owner:
-            selected = action_list.get(call_action)
+        pipeline = self.pipelines.get(call_action)
 
-        else:
-            selected = action_list.get("not_msg_owner")
-
-        if selected is None:
+        if pipeline is None:
             log_text = f'Could not call action "{call_action}"'
             await logger.info(log_text)
 
             return False
 
-        selected = selected(super().api)
-        result = await selected(event)
+        if not pipeline.action.validate(payload):
+            log_text = (
+                f'Invalid payload for action "{pipeline.action.NAME}" '
+                f"<{event.get('event_id')}>"
+            )
+            await logger.info(log_text)
+
+            return False
+
+        # VK calls the action makes together go out in one request.
+        with collecting(self.api) if config.VK_EXECUTE else nullcontext():
+            result = await pipeline(event)
 
         log_text = f"Event <{event.get('event_id')}> "
 
         if result:
-            log_text += f'triggered "{selected.NAME}" action.'
+            log_text += f'triggered "{pipeline.action.NAME}" action.'
 
         else:
             log_text += "did not triggered any action."
@@ -47,9 +75,12 @@ class ButtonHandler(ABCHandler):
         await logger.info(log_text)
         return result
 
-    async def __get_kbdowner(self, event: dict) -> int:
-        payload = event.get("payload")
-        return payload.get("keyboard_owner")
+    def _build_pipeline(self, action) -> Pipeline:
+        names = action.MIDDLEWARES
+        if names is None:
+            names = config.MIDDLEWARES
+
+        return Pipeline([self.middlewares[name] for name in names], action)
 
 
 button_handler = ButtonHandler()
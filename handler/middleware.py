@@ -0,0 +1,157 @@
+import time
+import traceback
+from collections import OrderedDict
+import config
+from dispatcher import received_at
+from logger import logger
+from .dedup import DedupWindow
+from .pipeline import ERRORS
+
+
+class Middleware(object):
+    """Handler middleware base class.
+    Wraps action dispatch: gets the event, the selected
+    action and the next stage of the pipeline. Returning
+    without calling the next stage stops the event.
+    """
+
+    NAME = "None"
+
+    async def __call__(self, event: dict, action, call_next) -> bool:
+        return await call_next(event)
+
+
+class ErrorCaptureMiddleware(Middleware):
+    """Logs exceptions raised by the next stages
+    and treats the event as not handled.
+    """
+
+    NAME = "errors"
+
+    def __init__(self):
+        self.errors = 0
+
+    async def __call__(self, event: dict, action, call_next) -> bool:
+        try:
+            return await call_next(event)
+
+        except Exception:
+            self.errors += 1
+            ERRORS.labels(action.NAME).inc()
+            log_text = (
+                f'Action "{action.NAME}" failed on event '
+                f"<{event.get('event_id')}>:\n{traceback.format_exc()}"
+            )
+            await logger.error(log_text)
+
+            return False
+
+
+class TimingMiddleware(Middleware):
+    """Logs events handled slower than the threshold."""
+
+    NAME = "timing"
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+
+    async def __call__(self, event: dict, action, call_next) -> bool:
+        started = time.perf_counter()
+        result = await call_next(event)
+        elapsed = time.perf_counter() - started
+
+        if self.threshold and elapsed > self.threshold:
+            log_text = (
+                f'Slow action "{action.NAME}" on event '
+                f"<{event.get('event_id')}>: {elapsed * 1000:.1f} ms"
+            )
+            await logger.warning(log_text)
+
+        return result
+
+
+class DedupMiddleware(Middleware):
+    """Drops repeated clicks and redelivered events."""
+
+    NAME = "dedup"
+
+    def __init__(self, window: DedupWindow):
+        self.window = window
+
+    @property
+    def suppressed(self) -> int:
+        return self.window.suppressed
+
+    async def __call__(self, event: dict, action, call_next) -> bool:
+        # Checked against the time the event was received at: a repeated
+        # click waits in the shard queue while the first one is handled.
+        if self.window.is_duplicate(event, received_at.get(None)):
+            log_text = f"Duplicate event <{event.get('event_id')}> suppressed"
+            await logger.info(log_text)
+
+            return False
+
+        return await call_next(event)
+
+
+class RateLimitMiddleware(Middleware):
+    """Per user clicks limiter (token bucket).
+    Drops clicks of the user exceeding the rate.
+
+    Args:
+        rate (float): Clicks per second. 0 disables the limiter.
+        burst (int): Maximum count of clicks in a row.
+        size (int): Maximum count of tracked users.
+    """
+
+    NAME = "rate_limit"
+
+    def __init__(self, rate: float, burst: int, size: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.size = size
+        self.limited = 0
+
+        # user_id -> (tokens, last update time), recently used last.
+        self._buckets = OrderedDict()
+
+    async def __call__(self, event: dict, action, call_next) -> bool:
+        if self.rate > 0 and not self._take(event.get("user_id")):
+            self.limited += 1
+            return False
+
+        return await call_next(event)
+
+    def _take(self, user_id: int) -> bool:
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(user_id, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+
+        self._buckets[user_id] = (tokens, now)
+        if len(self._buckets) > self.size:
+            self._buckets.popitem(last=False)
+
+        return allowed
+
+
+def build_middlewares() -> dict:
+    """Creates middleware objects shared by
+    pipelines of all actions.
+
+    Returns:
+        dict: Middleware objects by middleware name.
+    """
+    middlewares = (
+        ErrorCaptureMiddleware(),
+        TimingMiddleware(threshold=config.SLOW_EVENT_THRESHOLD),
+        DedupMiddleware(
+            DedupWindow(window=config.DEDUP_WINDOW, size=config.DEDUP_SIZE)
+        ),
+        RateLimitMiddleware(rate=config.CLICK_RATE, burst=config.CLICK_BURST),
+    )
+
+    return {middleware.NAME: middleware for middleware in middlewares}
@@ -21,6 +21,10 @@ class Logger(LoggingFormatters):
         date = date.replace("-", ".")
         date = date.replace(":", "-")
 
+        # Worker processes of one supervisor start at the same second.
+        if config.WORKER_NAME:
+            date += "." + config.WORKER_NAME
+
         stream_handler = logging.StreamHandler()
         file_handler = logging.FileHandler(
             filename="./logs/" + date + ".log", encoding="utf-8", mode="w"
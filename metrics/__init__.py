@@ -0,0 +1,13 @@
+"""Module "metrics".
+About:
+    Low-overhead service metrics (counters, gauges,
+    histograms) and a tiny HTTP server exposing them
+    in Prometheus text format at /metrics, event loop
+    lag monitor.
+"""
+
+from .registry import registry
+from .server import MetricsServer
+from .loop import LoopMonitor
+
+__all__ = ("registry", "MetricsServer", "LoopMonitor")
@@ -0,0 +1,105 @@
+"""Module "metrics"."""
+
+import sys
+import time
+import asyncio
+import threading
+import traceback
+from logger import logger
+from .registry import registry
+
+LOOP_LAG = registry.histogram(
+    "event_loop_lag_seconds", "Delay of scheduled event loop wakeups."
+).labels()
+LOOP_BLOCKS = registry.counter(
+    "event_loop_blocks_total",
+    "Times the event loop was blocked longer than the threshold.",
+).labels()
+
+
+class LoopMonitor(object):
+    """Event loop lag monitor.
+    A task on the loop sleeps for the interval and observes
+    how late it wakes up. A watchdog thread checks that the task
+    keeps waking up: if the loop is blocked longer than the threshold,
+    the block is counted and, in debug mode, the current stack of the
+    loop thread is logged, i.e. the call blocking the loop.
+
+    Args:
+        interval (float): Lag measurement interval in seconds.
+        threshold (float): Blocking time in seconds to report.
+        0 disables the watchdog.
+        debug (bool, optional): Log stacks of blocking calls.
+        Defaults to False.
+    """
+
+    def __init__(self, interval: float, threshold: float, debug: bool = False):
+        self.interval = interval
+        self.threshold = threshold
+        self.debug = debug
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.blocks = 0
+
+        self._beat = 0.0
+        self._loop_thread: int = None
+        self._task: asyncio.Task = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Starts monitoring the running event loop."""
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._measure())
+
+        if self.threshold > 0:
+            watchdog = threading.Thread(
+                target=self._watch, name="loop-watchdog", daemon=True
+            )
+            watchdog.start()
+
+    def stop(self):
+        """Stops monitoring."""
+        self._stopped.set()
+
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _measure(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+
+            now = time.monotonic()
+            self.lag = max(0.0, now - expected)
+            self.max_lag = max(self.max_lag, self.lag)
+            self._beat = now
+            LOOP_LAG.observe(self.lag)
+
+    def _watch(self):
+        reported = None
+
+        while not self._stopped.wait(self.threshold / 2):
+            beat = self._beat
+            blocked = time.monotonic() - beat - self.interval
+
+            # One report per block: the beat changes once the loop is free.
+            if blocked < self.threshold or beat == reported:
+                continue
+
+            reported = beat
+            self.blocks += 1
+            LOOP_BLOCKS.inc()
+
+            if not self.debug:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread)
+            stack = "".join(traceback.format_stack(frame)) if frame else ""
+
+            # The loop is blocked, so the async logger API cannot be awaited.
+            log_text = (
+                f"Event loop is blocked for {blocked * 1000:.0f} ms "
+                f"(still running):\n{stack}"
+            )
+            logger.logger.warning(log_text)
@@ -0,0 +1,181 @@
+"""Module "metrics"."""
+
+from bisect import bisect_left
+
+# Seconds. Covers everything from a cached lookup to a VK timeout.
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Counter(object):
+    """Monotonic counter."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+
+class Gauge(object):
+    """Value that can go up and down."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Histogram(object):
+    """Fixed buckets histogram.
+    Observing a value only increments preallocated
+    counters, nothing is allocated per observation.
+
+    Args:
+        bounds (tuple): Sorted upper bounds of buckets.
+    """
+
+    __slots__ = ("bounds", "buckets", "count", "sum")
+
+    def __init__(self, bounds: tuple = DEFAULT_BUCKETS):
+        self.bounds = bounds
+        # The last bucket is +Inf.
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+
+class MetricFamily(object):
+    """Metric with a fixed set of label names.
+    Children are created once per distinct label values.
+
+    Args:
+        kind (str): "counter", "gauge" or "histogram".
+        name (str): Metric name.
+        description (str): Metric help text.
+        labels (tuple): Label names.
+        factory (Callable): Child metric factory.
+        callback (Callable, optional): Called on every scrape, returns
+        either a value (no labels) or a dict of values by label values.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        name: str,
+        description: str,
+        labels: tuple,
+        factory,
+        callback=None,
+    ):
+        self.kind = kind
+        self.name = name
+        self.description = description
+        self.label_names = labels
+        self.factory = factory
+        self.callback = callback
+        self.children = {}
+
+    def labels(self, *values):
+        """Returns the child metric for label values.
+
+        Returns:
+            object: Counter, Gauge or Histogram.
+        """
+        child = self.children.get(values)
+
+        if child is None:
+            child = self.children[values] = self.factory()
+
+        return child
+
+    def render(self) -> list:
+        """Returns lines of Prometheus text format.
+
+        Returns:
+            list: Text lines.
+        """
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+        if self.callback is not None:
+            values = self.callback()
+            if not isinstance(values, dict):
+                values = {(): values}
+
+            for label_values, value in values.items():
+                lines.append(f"{self.name}{self._labels(label_values)} {value}")
+
+            return lines
+
+        for label_values, child in list(self.children.items()):
+            if self.kind == "histogram":
+                lines.extend(self._render_histogram(label_values, child))
+
+            else:
+                lines.append(f"{self.name}{self._labels(label_values)} {child.value}")
+
+        return lines
+
+    def _render_histogram(self, label_values: tuple, child: Histogram) -> list:
+        lines = []
+        cumulative = 0
+
+        for bound, count in zip(child.bounds + ("+Inf",), child.buckets):
+            cumulative += count
+            labels = self._labels(label_values, ("le", bound))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+
+        labels = self._labels(label_values)
+        lines.append(f"{self.name}_sum{labels} {child.sum}")
+        lines.append(f"{self.name}_count{labels} {child.count}")
+
+        return lines
+
+    def _labels(self, values: tuple, extra: tuple = None) -> str:
+        if not isinstance(values, tuple):
+            values = (values,)
+
+        pairs = list(zip(self.label_names, values))
+        if extra is not None:
+            pairs.append(extra)
+
+        if not pairs:
+            return ""
+
+        body = ",".join(f'{name}="{self._escape(value)}"' for name, value in pairs)
+        return "{" + body + "}"
+
+    @staticmethod
+    def _escape(value) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,77 @@
+"""Module "metrics"."""
+
+from .metrics import DEFAULT_BUCKETS, Counter, Gauge, Histogram, MetricFamily
+
+
+class Registry(object):
+    """Service metrics registry."""
+
+    def __init__(self):
+        self._families = {}
+
+    def counter(self, name: str, description: str, labels: tuple = (), callback=None):
+        """Registers a counter family. Counter with callback
+        reads its values on every scrape.
+
+        Returns:
+            MetricFamily: Counter family.
+        """
+        return self._register(
+            MetricFamily("counter", name, description, labels, Counter, callback)
+        )
+
+    def gauge(self, name: str, description: str, labels: tuple = (), callback=None):
+        """Registers a gauge family. Gauge with callback
+        reads its values on every scrape.
+
+        Returns:
+            MetricFamily: Gauge family.
+        """
+        return self._register(
+            MetricFamily("gauge", name, description, labels, Gauge, callback)
+        )
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labels: tuple = (),
+        buckets: tuple = DEFAULT_BUCKETS,
+    ):
+        """Registers a histogram family.
+
+        Returns:
+            MetricFamily: Histogram family.
+        """
+        return self._register(
+            MetricFamily(
+                "histogram", name, description, labels, lambda: Histogram(buckets)
+            )
+        )
+
+    def render(self) -> str:
+        """Returns all metrics in Prometheus text format.
+
+        Returns:
+            str: Metrics text.
+        """
+        lines = []
+
+        for family in list(self._families.values()):
+            lines.extend(family.render())
+
+        return "\n".join(lines) + "\n"
+
+    def _register(self, family: MetricFamily) -> MetricFamily:
+        # Re-registration returns the existing family, so a module
+        # can be imported by several entry points safely.
+        existing = self._families.get(family.name)
+        if existing is not None:
+            existing.callback = family.callback or existing.callback
+            return existing
+
+        self._families[family.name] = family
+        return family
+
+
+registry = Registry()
@@ -0,0 +1,65 @@
+"""Module "metrics"."""
+
+import asyncio
+from logger import logger
+from .registry import Registry
+
+
+class MetricsServer(object):
+    """Minimal HTTP server exposing the registry
+    at GET /metrics. Runs on the service event loop.
+
+    Args:
+        registry (Registry): Metrics registry.
+        host (str): Interface to listen on.
+        port (int): Port to listen on.
+    """
+
+    def __init__(self, registry: Registry, host: str, port: int):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: asyncio.AbstractServer = None
+
+    async def start(self):
+        """Starts listening for scrapes."""
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+
+        log_text = f"Metrics are exposed at http://{self.host}:{self.port}/metrics"
+        await logger.info(log_text)
+
+    async def stop(self):
+        """Stops the server."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+            method, path = request.split(b" ", 2)[:2]
+
+            if method == b"GET" and path.split(b"?", 1)[0] == b"/metrics":
+                status = "200 OK"
+                body = self.registry.render().encode("utf-8")
+
+            else:
+                status = "404 Not Found"
+                body = b"Not Found\n"
+
+            writer.write(
+                (
+                    f"HTTP/1.1 {status}\r\n"
+                    "Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    "Connection: close\r\n\r\n"
+                ).encode("ascii")
+                + body
+            )
+            await writer.drain()
+
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+
+        finally:
+            writer.close()
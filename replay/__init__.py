@@ -0,0 +1,20 @@
+"""Module "replay".
+About:
+    Traffic replay harness. Feeds the file captured
+    with CAPTURE_PATH through the button handler against
+    stubbed VK API and in-memory database. The stub VK API
+    is either in-process or a local HTTP server.
+
+Usage:
+    python -m replay capture.jsonl [--speed 1.0] [--vk-latency 0.05]
+        [--vk-server [--vk-error-rate 0.01] [--vk-rate-limit 20]]
+    python -m replay.vk_server [--port 8080] [--latency 0.05]
+"""
+
+import os
+
+# Replay never touches real services, so the database backend is
+# forced and required service settings get placeholder values.
+os.environ["DB_BACKEND"] = "memory"
+os.environ.setdefault("GROUPID", "0")
+os.environ.setdefault("SQL_PORT", "3306")
@@ -0,0 +1,115 @@
+"""Module "replay"."""
+
+import asyncio
+import argparse
+import config
+from consumer import TrafficRecorder
+from db import db
+from handler import ButtonHandler
+from vk import AsyncVkApi
+from .latency import Latency
+from .player import Player
+from .stubs import StubApi, default_tables
+from .vk_server import StubVkServer
+
+
+async def play_with_server(server: StubVkServer, records: list, args) -> tuple:
+    """Plays records against the stub VK server.
+
+    Returns:
+        tuple: Handler, player and elapsed time.
+    """
+    await server.start()
+    api = AsyncVkApi(token="stub", api_version=config.API_VERSION, url=server.url)
+    handler = ButtonHandler(api=api)
+    player = Player(handler, speed=args.speed, concurrency=args.concurrency)
+
+    try:
+        elapsed = await player.play(records)
+
+    finally:
+        await api.close()
+        await server.stop()
+
+    return handler, player, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m replay", description="Replay captured button events."
+    )
+    parser.add_argument("capture", help="JSONL file written with CAPTURE_PATH")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="playback speed multiplier, 0 - as fast as possible",
+    )
+    parser.add_argument(
+        "--vk-latency",
+        type=Latency.parse,
+        default=Latency(),
+        help="stub VK round trip, e.g. 0.05 or lognormal:0.05,0.5",
+    )
+    parser.add_argument(
+        "--vk-server",
+        action="store_true",
+        help="call the local stub VK server over HTTP instead of the in-process stub",
+    )
+    parser.add_argument("--vk-error-rate", type=float, default=0.0)
+    parser.add_argument("--vk-rate-limit", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=config.DISPATCH_CONCURRENCY)
+    args = parser.parse_args()
+
+    for name, rows in default_tables().items():
+        db.execute.executer.tables[name].extend(rows)
+
+    records = TrafficRecorder.load(args.capture)
+
+    if args.vk_server:
+        server = StubVkServer(
+            latency=args.vk_latency,
+            error_rate=args.vk_error_rate,
+            rate_limit=args.vk_rate_limit,
+        )
+        handler, player, elapsed = asyncio.run(play_with_server(server, records, args))
+        calls = server.calls
+
+    else:
+        api = StubApi(latency=args.vk_latency)
+        handler = ButtonHandler(api=api)
+        player = Player(handler, speed=args.speed, concurrency=args.concurrency)
+        elapsed = asyncio.run(player.play(records))
+        calls = api.calls
+
+    dispatcher = player.dispatcher
+    print(f"Events:     {len(records)}")
+    print(f"Handled:    {dispatcher.handled} (failed: {dispatcher.failed})")
+    print(f"Suppressed: {handler.middlewares['dedup'].suppressed}")
+    print(f"Elapsed:    {elapsed:.3f} s")
+    print(f"Throughput: {len(records) / max(elapsed, 1e-9):.1f} events/s")
+    print(f"DB queries: {db.execute.executer.queries}")
+
+    monitor = player.monitor
+    print(f"Loop lag:   max {monitor.max_lag * 1000:.1f} ms, {monitor.blocks} blocks")
+
+    for method, count in sorted(calls.items()):
+        print(f"VK {method}: {count}")
+
+    if args.vk_server:
+        errors = sum(server.errors.values())
+        print(f"VK server:  {server.requests} requests, {errors} errors")
+
+    print("Stage timings (mean ms, own time of each stage):")
+    for name, pipeline in sorted(handler.pipelines.items()):
+        stages = ", ".join(
+            f"{stage}={timing.mean * 1000:.3f}"
+            for stage, timing in pipeline.timings.items()
+            if timing.count
+        )
+        if stages:
+            print(f"  {name}: {stages}")
+
+
+if __name__ == "__main__":
+    main()
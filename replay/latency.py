@@ -0,0 +1,73 @@
+"""Module "replay"."""
+
+import random
+
+
+class Latency(object):
+    """Emulated round trip time distribution.
+
+    Specification formats (seconds):
+        "0.05" - fixed,
+        "uniform:0.01,0.1" - uniform between bounds,
+        "normal:0.05,0.01" - normal with mean and deviation,
+        "lognormal:0.05,0.5" - log-normal with median and sigma,
+        "exp:0.05" - exponential with mean.
+
+    Args:
+        kind (str): Distribution name.
+        params (tuple): Distribution parameters.
+    """
+
+    def __init__(self, kind: str = "fixed", params: tuple = (0.0,)):
+        self.kind = kind
+        self.params = params
+
+    @classmethod
+    def parse(cls, spec: str) -> "Latency":
+        """Creates the distribution from its specification.
+
+        Args:
+            spec (str): Distribution specification.
+
+        Raises:
+            ValueError: Unknown distribution or bad parameters.
+
+        Returns:
+            Latency: Distribution.
+        """
+        kind, _, params = str(spec).rpartition(":")
+        values = tuple(float(value) for value in params.split(","))
+        kind = kind or "fixed"
+
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exp": 1}
+        if expected.get(kind) != len(values):
+            raise ValueError(f'Invalid latency specification "{spec}"')
+
+        return cls(kind, values)
+
+    def sample(self) -> float:
+        """Returns a random round trip time.
+
+        Returns:
+            float: Time in seconds, not negative.
+        """
+        if self.kind == "fixed":
+            return self.params[0]
+
+        if self.kind == "uniform":
+            return random.uniform(*self.params)
+
+        if self.kind == "normal":
+            return max(0.0, random.gauss(*self.params))
+
+        if self.kind == "lognormal":
+            median, sigma = self.params
+            return random.lognormvariate(0.0, sigma) * median
+
+        return random.expovariate(1 / self.params[0]) if self.params[0] else 0.0
+
+    def __bool__(self) -> bool:
+        return self.kind != "fixed" or self.params[0] > 0
+
+    def __repr__(self) -> str:
+        return f"Latency({self.kind}: {', '.join(map(str, self.params))})"
@@ -0,0 +1,61 @@
+"""Module "replay"."""
+
+import time
+import asyncio
+import config
+from consumer.codecs import codecs
+from dispatcher import Dispatcher
+from metrics import LoopMonitor
+
+
+class Player(object):
+    """Captured traffic player.
+    Submits recorded events to the dispatcher keeping
+    the original intervals between them, scaled by speed.
+
+    Args:
+        handler (Callable): Coroutine function handling an event.
+        speed (float): Playback speed multiplier.
+        0 plays as fast as possible.
+        concurrency (int): Count of dispatcher shards.
+    """
+
+    def __init__(self, handler, speed: float, concurrency: int):
+        self.speed = speed
+        self.dispatcher = Dispatcher(
+            handler, concurrency=concurrency, queue_size=concurrency * 4
+        )
+        self.monitor = LoopMonitor(
+            interval=config.LOOP_LAG_INTERVAL,
+            threshold=config.LOOP_BLOCK_THRESHOLD,
+            debug=config.LOOP_DEBUG,
+        )
+
+    async def play(self, records: list) -> float:
+        """Plays records and waits until all of them are handled.
+
+        Args:
+            records (list): Records loaded with TrafficRecorder.load().
+
+        Returns:
+            float: Elapsed time in seconds.
+        """
+        self.dispatcher.start()
+        self.monitor.start()
+        started = time.monotonic()
+
+        for record in records:
+            if self.speed > 0:
+                offset = (record["ts"] - records[0]["ts"]) / self.speed
+                delay = started + offset - time.monotonic()
+
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            codec = codecs.get(record.get("content_type"))
+            await self.dispatcher.submit(codec.decode(record["body"]))
+
+        await self.dispatcher.stop()
+        self.monitor.stop()
+
+        return time.monotonic() - started
@@ -0,0 +1,104 @@
+"""Module "replay"."""
+
+import asyncio
+from collections import Counter
+from .latency import Latency
+
+SYSTEMS = (
+    "account_age",
+    "curse_words",
+    "open_pm",
+    "slow_mode",
+    "url_filtering",
+    "hard_url_filtering",
+)
+FILTERS = (
+    "app_action",
+    "audio",
+    "audio_message",
+    "doc",
+    "forward",
+    "reply",
+    "graffiti",
+    "sticker",
+    "link",
+    "photo",
+    "poll",
+    "video",
+    "wall",
+    "geo",
+)
+DELAYS = (
+    "slow_mode",
+    "account_age",
+    "menu_session",
+    "red_zone",
+    "yellow_zone",
+    "green_zone",
+)
+
+
+def default_tables() -> dict:
+    """Returns settings rows shared by every conversation,
+    so menu actions find all the settings they render.
+
+    Returns:
+        dict: Rows by "schema.table" name.
+    """
+    settings = [
+        {
+            "setting_name": name,
+            "setting_status": 0,
+            "setting_destination": destination,
+            "warn_point": 0,
+        }
+        for names, destination in ((SYSTEMS, "system"), (FILTERS, "filter"))
+        for name in names
+    ]
+    delay = [{"setting_name": name, "delay": 1} for name in DELAYS]
+
+    return {"toaster_settings.settings": settings, "toaster_settings.delay": delay}
+
+
+class StubApi(object):
+    """VK API stand-in with the AsyncVkApi call surface.
+    Counts calls by method name and returns canned results.
+
+    Args:
+        latency (Latency, optional): Emulated round trip time.
+        Defaults to no latency.
+    """
+
+    RESULTS = {
+        "users.get": lambda params: [
+            {"id": int(user_id), "first_name": "Stub", "last_name": "User"}
+            for user_id in str(params.get("user_ids")).strip("[]").split(",")
+        ]
+    }
+
+    def __init__(self, latency: Latency = None):
+        self.latency = latency or Latency()
+        self.calls = Counter()
+
+    def __getattr__(self, name: str):
+        return StubMethod(self, name)
+
+
+class StubMethod(object):
+    """VK API method stand-in."""
+
+    def __init__(self, api: StubApi, name: str):
+        self._api = api
+        self._name = name
+
+    def __getattr__(self, name: str):
+        return StubMethod(self._api, f"{self._name}.{name}")
+
+    async def __call__(self, **params):
+        self._api.calls[self._name] += 1
+
+        if self._api.latency:
+            await asyncio.sleep(self._api.latency.sample())
+
+        result = self._api.RESULTS.get(self._name, 1)
+        return result(params) if callable(result) else result
@@ -0,0 +1,259 @@
+"""Module "replay".
+
+Local VK API stand-in server for load tests:
+
+    python -m replay.vk_server [--port 8080] [--latency lognormal:0.05,0.5]
+        [--error-rate 0.01] [--http-error-rate 0.01] [--rate-limit 20]
+
+Point the service at it with VK_API_URL=http://127.0.0.1:8080/method.
+"""
+
+import re
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+from collections import Counter, deque
+from aiohttp import web
+from .latency import Latency
+
+
+class StubVkServer(object):
+    """VK API stand-in HTTP server.
+    Serves POST /method/<name> for messages.edit, messages.delete,
+    messages.sendMessageEventAnswer, users.get and execute with
+    emulated latency, injected errors and the requests per second
+    limit. Every call, including calls inside execute, is recorded.
+
+    Args:
+        host (str, optional): Interface to listen on. Defaults to "127.0.0.1".
+        port (int, optional): Port to listen on, 0 - any free port.
+        Defaults to 0.
+        latency (Latency, optional): Request handling time.
+        Defaults to no latency.
+        error_rate (float, optional): Share of calls failing with
+        VK "Internal server error". Defaults to 0.
+        http_error_rate (float, optional): Share of requests failing
+        with HTTP 502. Defaults to 0.
+        rate_limit (int, optional): Requests per second served,
+        others fail with VK "Too many requests per second".
+        0 - unlimited. Defaults to 0.
+    """
+
+    METHODS = (
+        "messages.edit",
+        "messages.delete",
+        "messages.sendMessageEventAnswer",
+        "users.get",
+    )
+
+    _call_pattern = re.compile(r"API\.([\w.]+)\(")
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: Latency = None,
+        error_rate: float = 0.0,
+        http_error_rate: float = 0.0,
+        rate_limit: int = 0,
+    ):
+        self.host = host
+        self.port = port
+        self.latency = latency or Latency()
+        self.error_rate = error_rate
+        self.http_error_rate = http_error_rate
+        self.rate_limit = rate_limit
+
+        # Calls by method name, "execute" requests included.
+        self.calls = Counter()
+        # (time, method, params) of every call.
+        self.log = []
+        self.requests = 0
+        self.errors = Counter()
+
+        self._served = deque()
+        self._runner: web.AppRunner = None
+
+    @property
+    def url(self) -> str:
+        """Returns the value for VK_API_URL."""
+        return f"http://{self.host}:{self.port}/method"
+
+    async def start(self):
+        """Starts serving on the running event loop."""
+        app = web.Application()
+        app.router.add_post("/method/{method}", self._handle)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        self.port = sock.getsockname()[1]
+
+        await web.SockSite(self._runner, sock).start()
+
+    async def stop(self):
+        """Stops the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def reset(self):
+        """Forgets recorded calls."""
+        self.calls.clear()
+        self.log.clear()
+        self.errors.clear()
+        self.requests = 0
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        params = dict(await request.post())
+        self.requests += 1
+
+        if self.latency:
+            await asyncio.sleep(self.latency.sample())
+
+        if random.random() < self.http_error_rate:
+            self.errors["http"] += 1
+            return web.Response(status=502, text="Bad Gateway")
+
+        if self._limited():
+            self.errors["rate_limit"] += 1
+            return web.json_response(self._error(6, "Too many requests per second"))
+
+        if method == "execute":
+            return web.json_response(self._execute(params.get("code", "")))
+
+        result = self._call(method, params)
+
+        if isinstance(result, dict):
+            return web.json_response(result)
+
+        return web.json_response({"response": result})
+
+    def _execute(self, code: str) -> dict:
+        self._record("execute", {"code": code})
+        decoder = json.JSONDecoder()
+        response, errors = [], []
+
+        for match in self._call_pattern.finditer(code):
+            try:
+                params, _ = decoder.raw_decode(code, match.end())
+
+            except ValueError:
+                return self._error(12, "Unable to compile code")
+
+            result = self._call(match.group(1), params)
+
+            if isinstance(result, dict):
+                error = result["error"]
+                errors.append(dict(error, method=match.group(1)))
+                response.append(False)
+
+            else:
+                response.append(result)
+
+        body = {"response": response}
+        if errors:
+            body["execute_errors"] = errors
+
+        return body
+
+    def _call(self, method: str, params: dict):
+        """Returns the method result or the error object."""
+        self._record(method, params)
+
+        if method not in self.METHODS:
+            self.errors["unknown_method"] += 1
+            return self._error(3, "Unknown method passed")
+
+        if random.random() < self.error_rate:
+            self.errors["server"] += 1
+            return self._error(10, "Internal server error")
+
+        if method == "users.get":
+            return [
+                {"id": int(user_id), "first_name": "Stub", "last_name": "User"}
+                for user_id in str(params.get("user_ids", "")).split(",")
+                if user_id.strip()
+            ]
+
+        return 1
+
+    def _record(self, method: str, params: dict):
+        self.calls[method] += 1
+        self.log.append((time.time(), method, params))
+
+    def _limited(self) -> bool:
+        if self.rate_limit <= 0:
+            return False
+
+        now = time.monotonic()
+        while self._served and now - self._served[0] >= 1:
+            self._served.popleft()
+
+        if len(self._served) >= self.rate_limit:
+            return True
+
+        self._served.append(now)
+        return False
+
+    @staticmethod
+    def _error(code: int, message: str) -> dict:
+        return {"error": {"error_code": code, "error_msg": message}}
+
+
+async def serve(server: StubVkServer):
+    await server.start()
+    print(f"Stub VK API is listening at {server.url}")
+
+    try:
+        await asyncio.Event().wait()
+
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m replay.vk_server", description="Local VK API stand-in."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--latency", type=Latency.parse, default=Latency(), help="e.g. uniform:0.01,0.1"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--http-error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--rate-limit", type=int, default=0, help="requests per second, 0 - unlimited"
+    )
+    args = parser.parse_args()
+
+    server = StubVkServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        http_error_rate=args.http_error_rate,
+        rate_limit=args.rate_limit,
+    )
+
+    try:
+        asyncio.run(serve(server))
+
+    except KeyboardInterrupt:
+        pass
+
+    print(f"Requests: {server.requests}")
+    for method, count in sorted(server.calls.items()):
+        print(f"{method}: {count}")
+
+
+if __name__ == "__main__":
+    main()
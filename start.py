@@ -8,21 +8,200 @@ Author:
 """
 
 import asyncio
-from consumer import consumer
+import threading
+from typing import Callable
+from functools import partial
+import config
+from consumer import consumer, async_consumer
+from db import db
+from dispatcher import Dispatcher
 from handler import button_handler
 from logger import logger
+from metrics import registry, MetricsServer, LoopMonitor
 
 
-async def main():
-    """Entry point."""
-    log_text = "Awaiting button events..."
+async def listen(queue: str):
+    """Yields events from the queue using
+    the configured consumer mode.
+
+    Args:
+        queue (str): Queue name in RabbitMQ.
+
+    Yields:
+        AsyncIterator[tuple]: Delivery tag and button event data.
+        Blocking consumer acknowledges on delivery, so its tag is None.
+    """
+    if config.CONSUMER_MODE == "blocking":
+        # Blocking consumer waits for deliveries in its own thread,
+        # so dispatched events are handled in the meantime. The thread
+        # is a daemon one: it may wait for a delivery forever, while
+        # the queue is idle, and must not keep the process alive.
+        loop = asyncio.get_running_loop()
+        deliveries = asyncio.Queue(maxsize=1)
+
+        def feed():
+            try:
+                for data in consumer.listen_queue(queue):
+                    put = deliveries.put(data)
+                    asyncio.run_coroutine_threadsafe(put, loop).result()
+
+                error = ConnectionError("Blocking consumer stopped")
+
+            except Exception as exc:
+                error = exc
+
+            asyncio.run_coroutine_threadsafe(deliveries.put(error), loop)
+
+        threading.Thread(target=feed, name="consumer", daemon=True).start()
+
+        while True:
+            data = await deliveries.get()
+
+            if isinstance(data, Exception):
+                raise data
+
+            yield None, data
+
+    else:
+        async for tag, data in async_consumer.listen_queue(queue):
+            yield tag, data
+
+
+async def report_stats(dispatcher: Dispatcher, stats: Callable[[dict], None]):
+    """Periodically passes dispatcher counters
+    to the stats callback.
+
+    Args:
+        dispatcher (Dispatcher): Service dispatcher.
+        stats (Callable): Stats callback.
+    """
+    while True:
+        await asyncio.sleep(config.STATS_INTERVAL)
+        stats(
+            {
+                "handled": dispatcher.handled,
+                "failed": dispatcher.failed,
+                "in_flight": dispatcher.in_flight,
+                "queued": sum(dispatcher.queue_depth),
+            }
+        )
+
+
+def register_metrics(dispatcher: Dispatcher):
+    """Registers metrics read from service
+    counters on every scrape.
+
+    Args:
+        dispatcher (Dispatcher): Service dispatcher.
+    """
+    middlewares = button_handler.middlewares
+
+    registry.counter(
+        "consumer_deliveries_total",
+        "Deliveries received from RabbitMQ.",
+        callback=lambda: async_consumer.received,
+    )
+    registry.counter(
+        "consumer_stale_total",
+        "Stale deliveries shed before handling.",
+        callback=lambda: async_consumer.stale.expired + consumer.stale.expired,
+    )
+    registry.counter(
+        "dispatcher_events_total",
+        "Events handled by the dispatcher.",
+        ("result",),
+        callback=lambda: {"handled": dispatcher.handled, "failed": dispatcher.failed},
+    )
+    registry.gauge(
+        "dispatcher_in_flight",
+        "Events being handled now.",
+        callback=lambda: dispatcher.in_flight,
+    )
+    registry.gauge(
+        "dispatcher_queue_depth",
+        "Events waiting in dispatcher shard queues.",
+        ("shard",),
+        callback=lambda: dict(enumerate(dispatcher.queue_depth)),
+    )
+    registry.gauge(
+        "vk_rate_limit_queued",
+        "VK API requests waiting for the rate limiter.",
+        callback=lambda: button_handler.api.limiter.queued,
+    )
+    if db.pool is not None:
+        registry.gauge(
+            "db_pool_connections",
+            "MySQL pool connections.",
+            ("state",),
+            callback=lambda: {"open": db.pool.opened, "in_use": db.pool.in_use},
+        )
+    registry.counter(
+        "button_events_dropped_total",
+        "Events dropped by handler middlewares.",
+        ("reason",),
+        callback=lambda: {
+            "duplicate": middlewares["dedup"].suppressed,
+            "rate_limit": middlewares["rate_limit"].limited,
+        },
+    )
+
+
+async def main(queue: str = "buttons", stats: Callable[[dict], None] = None):
+    """Entry point.
+
+    Args:
+        queue (str, optional): Queue name in RabbitMQ. Defaults to "buttons".
+        stats (Callable, optional): Callback receiving dispatcher
+        counters every STATS_INTERVAL seconds. Defaults to None.
+    """
+    log_text = f"Awaiting button events from <{queue}>..."
     await logger.info(log_text)
 
-    for data in consumer.listen_queue("buttons"):
-        log_text = f"Recived new event: {data}"
-        await logger.info(log_text)
+    dispatcher = Dispatcher(
+        button_handler,
+        concurrency=config.DISPATCH_CONCURRENCY,
+        queue_size=config.DISPATCH_QUEUE_SIZE,
+    )
+    dispatcher.start()
+    register_metrics(dispatcher)
+
+    server = None
+    if config.METRICS_PORT:
+        server = MetricsServer(registry, config.METRICS_HOST, config.METRICS_PORT)
+        await server.start()
+
+    monitor = LoopMonitor(
+        interval=config.LOOP_LAG_INTERVAL,
+        threshold=config.LOOP_BLOCK_THRESHOLD,
+        debug=config.LOOP_DEBUG,
+    )
+    monitor.start()
+
+    reporter = None
+    if stats is not None:
+        reporter = asyncio.create_task(report_stats(dispatcher, stats))
+
+    try:
+        async for tag, data in listen(queue):
+            log_text = f"Recived new event: {data}"
+            await logger.info(log_text)
+
+            await dispatcher.submit(data, partial(async_consumer.ack, tag))
+
+    finally:
+        if reporter is not None:
+            reporter.cancel()
+
+        # Queued events still use the VK API and the DB,
+        # so they are drained before the clients are closed.
+        await dispatcher.stop()
+        monitor.stop()
+
+        if server is not None:
+            await server.stop()
 
-        await button_handler(data)
+        await button_handler.api.close()
+        await db.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,184 @@
+"""Service "toaster.button-handling-service" supervisor.
+About:
+    Multi-process mode. Starts a shard router and
+    WORKER_COUNT worker processes, each consuming its own
+    shard queue of the "buttons" traffic. Restarts dead
+    processes and collects worker counters.
+
+Author:
+    Oidaho (Ruslan Bashinskii)
+    oidahomain@gmail.com
+"""
+
+import os
+import time
+import queue
+import signal
+import asyncio
+import multiprocessing
+import config
+from logger import logger
+
+SOURCE_QUEUE = "buttons"
+# Minimal delay between restarts of the same process.
+RESTART_DELAY = 5
+
+
+def run_router(shards: int):
+    """Router process entry point."""
+    from consumer import ShardRouter
+
+    ShardRouter(SOURCE_QUEUE, shards).run()
+
+
+def run_worker(index: int, stats_queue: multiprocessing.Queue):
+    """Worker process entry point."""
+    import start
+    from consumer import ShardRouter
+
+    def stats(counters: dict):
+        counters.update(worker=index, pid=os.getpid())
+        stats_queue.put_nowait(counters)
+
+    shard_queue = ShardRouter.shard_queue(SOURCE_QUEUE, index)
+    asyncio.run(start.main(queue=shard_queue, stats=stats))
+
+
+class Supervisor(object):
+    """Worker processes supervisor class."""
+
+    def __init__(self, workers: int):
+        self._context = multiprocessing.get_context("spawn")
+        self._stats_queue = self._context.Queue()
+        self._workers = workers
+
+        # Process name -> (target, args, environment)
+        self._targets = {
+            "router": (run_router, (workers,), {"WORKER_NAME": "router"}),
+        }
+        for index in range(workers):
+            name = f"worker-{index}"
+            # Workers share the group token, so they share its rate limit.
+            environment = {
+                "WORKER_NAME": name,
+                "VK_RATE_LIMIT": str(config.VK_RATE_LIMIT / workers),
+            }
+
+            # Every worker exposes its metrics on its own port
+            # following METRICS_PORT.
+            if config.METRICS_PORT:
+                environment["METRICS_PORT"] = str(config.METRICS_PORT + 1 + index)
+
+            self._targets[name] = (
+                run_worker,
+                (index, self._stats_queue),
+                environment,
+            )
+
+        self._processes = {}
+        self._started = {}
+        self.stats = {}
+
+    async def run(self):
+        """Starts processes and watches them until cancelled."""
+        for name in self._targets:
+            self._start(name)
+
+        log_text = f"Supervisor started {self._workers} workers."
+        await logger.info(log_text)
+
+        reported = time.monotonic()
+
+        while True:
+            await asyncio.sleep(1)
+
+            for name, process in self._processes.items():
+                if process.is_alive():
+                    continue
+
+                if time.monotonic() - self._started[name] < RESTART_DELAY:
+                    continue
+
+                log_text = f"Process <{name}> exited with code {process.exitcode}."
+                await logger.warning(log_text)
+                self._start(name)
+
+            self._collect()
+
+            if time.monotonic() - reported >= config.STATS_INTERVAL:
+                reported = time.monotonic()
+                await logger.info(self._summary())
+
+    def stop(self):
+        """Terminates all processes."""
+        for process in self._processes.values():
+            process.terminate()
+
+        for process in self._processes.values():
+            process.join(timeout=RESTART_DELAY)
+
+    def _start(self, name: str):
+        target, args, environment = self._targets[name]
+        process = self._context.Process(target=target, args=args, name=name)
+
+        # Spawned process inherits the environment, so its service
+        # modules get their own WORKER_NAME, etc. when imported.
+        saved = {key: os.environ.get(key) for key in environment}
+        os.environ.update(environment)
+        try:
+            process.start()
+
+        finally:
+            for key, value in saved.items():
+                if value is None:
+                    del os.environ[key]
+
+                else:
+                    os.environ[key] = value
+
+        self._processes[name] = process
+        self._started[name] = time.monotonic()
+
+    def _collect(self):
+        while True:
+            try:
+                counters = self._stats_queue.get_nowait()
+
+            except queue.Empty:
+                return
+
+            self.stats[counters["worker"]] = counters
+
+    def _summary(self) -> str:
+        alive = sum(process.is_alive() for process in self._processes.values())
+        totals = {"handled": 0, "failed": 0, "in_flight": 0, "queued": 0}
+
+        for counters in self.stats.values():
+            for key in totals:
+                totals[key] += counters.get(key, 0)
+
+        summary = ", ".join(f"{key}={value}" for key, value in totals.items())
+        return f"Processes alive: {alive}/{len(self._processes)}. {summary}."
+
+
+async def main():
+    """Entry point."""
+    supervisor = Supervisor(workers=config.WORKER_COUNT)
+
+    loop = asyncio.get_running_loop()
+    task = asyncio.current_task()
+    loop.add_signal_handler(signal.SIGTERM, task.cancel)
+
+    try:
+        await supervisor.run()
+
+    finally:
+        supervisor.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
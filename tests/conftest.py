@@ -0,0 +1,224 @@
+"""Shared test fixtures.
+Service settings get placeholder values, and the database
+works on in-memory tables, so importing the service
+modules does not connect to external services.
+"""
+
+import os
+import sqlite3
+import threading
+from types import SimpleNamespace
+import pytest
+
+os.environ.setdefault("GROUPID", "0")
+os.environ.setdefault("SQL_PORT", "3306")
+os.environ.setdefault("DB_BACKEND", "memory")
+
+
+SCHEMAS = {
+    "toaster": (
+        """CREATE TABLE toaster.conversations (
+            id INTEGER PRIMARY KEY,
+            conv_id INTEGER UNIQUE,
+            conv_name TEXT,
+            conv_mark TEXT
+        )""",
+        """CREATE TABLE toaster.permissions (
+            id INTEGER PRIMARY KEY,
+            conv_id INTEGER,
+            user_id INTEGER,
+            user_name TEXT,
+            user_permission INTEGER,
+            UNIQUE (conv_id, user_id)
+        )""",
+    ),
+    "toaster_settings": (
+        """CREATE TABLE toaster_settings.settings (
+            id INTEGER PRIMARY KEY,
+            conv_id INTEGER,
+            setting_name TEXT,
+            setting_status INTEGER,
+            setting_destination TEXT
+        )""",
+    ),
+}
+
+
+class StandInServer(object):
+    """MySQL server stand-in on in-memory SQLite.
+    Schemas are attached databases, and the MySQL dialect
+    used by the executers is translated to SQLite one.
+    """
+
+    def __init__(self):
+        self.database = sqlite3.connect(":memory:", check_same_thread=False)
+        self.lock = threading.Lock()
+        self.statements = []
+        self.schema_switches = 0
+
+        for schema, tables in SCHEMAS.items():
+            self.database.execute(f"ATTACH DATABASE ':memory:' AS {schema}")
+            for table in tables:
+                self.database.execute(table)
+
+    def execute(self, query: str, params: tuple = None) -> tuple:
+        self.statements.append(query)
+        query = query.replace("%s", "?")
+        query = query.replace("ON DUPLICATE KEY UPDATE id=id", "ON CONFLICT DO NOTHING")
+        query = query.replace("ON DUPLICATE KEY UPDATE", "ON CONFLICT DO UPDATE SET")
+
+        with self.lock:
+            return tuple(self.database.execute(query, params or ()).fetchall())
+
+
+class StandInError(Exception):
+    """MySQLdb errors stand-in."""
+
+
+# Used when mysqlclient is not installed, the pool only needs
+# the driver errors besides connect().
+STAND_IN_DRIVER = SimpleNamespace(
+    Error=StandInError,
+    OperationalError=type("OperationalError", (StandInError,), {}),
+    InterfaceError=type("InterfaceError", (StandInError,), {}),
+    connect=None,
+)
+
+
+class StandInCursor(object):
+    def __init__(self, server: StandInServer):
+        self._server = server
+        self._rows = ()
+
+    def execute(self, query: str, params: tuple = None):
+        self._rows = self._server.execute(query, params)
+
+    def fetchall(self) -> tuple:
+        return self._rows
+
+    def close(self):
+        pass
+
+
+class StandInConnection(object):
+    """MySQLdb connection stand-in."""
+
+    def __init__(self, server: StandInServer):
+        self._server = server
+
+    def autocommit(self, enabled: bool):
+        pass
+
+    def select_db(self, schema: str):
+        self._server.schema_switches += 1
+
+    def cursor(self) -> StandInCursor:
+        return StandInCursor(self._server)
+
+    def close(self):
+        pass
+
+
+class AsyncStandInCursor(StandInCursor):
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def execute(self, query: str, params: tuple = None):
+        super().execute(query, params)
+
+    async def fetchall(self) -> tuple:
+        return super().fetchall()
+
+
+class AsyncStandInConnection(StandInConnection):
+    """aiomysql connection stand-in."""
+
+    closed = False
+
+    async def select_db(self, schema: str):
+        super().select_db(schema)
+
+    def cursor(self) -> AsyncStandInCursor:
+        return AsyncStandInCursor(self._server)
+
+
+class AsyncStandInPool(object):
+    """aiomysql pool stand-in."""
+
+    def __init__(self, server: StandInServer, maxsize: int):
+        self._server = server
+        self._free = []
+        self.size = 0
+
+    @property
+    def freesize(self) -> int:
+        return len(self._free)
+
+    async def acquire(self) -> AsyncStandInConnection:
+        if self._free:
+            return self._free.pop()
+
+        self.size += 1
+        return AsyncStandInConnection(self._server)
+
+    def release(self, connection: AsyncStandInConnection):
+        self._free.append(connection)
+
+    def close(self):
+        pass
+
+    async def wait_closed(self):
+        pass
+
+
+@pytest.fixture
+def server() -> StandInServer:
+    return StandInServer()
+
+
+def connect(backend: str, server: StandInServer, monkeypatch):
+    """Creates the asynchronous executer of the backend. MySQL
+    backends are connected to the stand-in server through the
+    real pool, only the driver connections are replaced.
+    """
+    from db import connection
+    from db.aio import AsyncExecuter, AsyncMySQLExecuter
+    from db.execute import Executer
+    from db.memory import MemoryExecuter
+
+    params = dict(host="stand-in", port=3306, user="test", password="")
+
+    if backend == "memory":
+        return AsyncExecuter(MemoryExecuter(), workers=0)
+
+    if backend == "mysql":
+        driver = connection.MySQLdb or STAND_IN_DRIVER
+        monkeypatch.setattr(connection, "MySQLdb", driver)
+        monkeypatch.setattr(driver, "connect", lambda **_: StandInConnection(server))
+        pool = connection.ConnectionPool(size=2, **params)
+        return AsyncExecuter(Executer(pool), workers=pool.size)
+
+    async def create_pool(maxsize: int, **_):
+        return AsyncStandInPool(server, maxsize)
+
+    monkeypatch.setattr(
+        connection, "aiomysql", SimpleNamespace(create_pool=create_pool)
+    )
+    return AsyncMySQLExecuter(connection.AsyncConnectionPool(size=2, **params))
+
+
+@pytest.fixture(params=("memory", "mysql", "aiomysql"))
+def executer(request, server, monkeypatch):
+    """Asynchronous executer of every backend."""
+    return connect(request.param, server, monkeypatch)
+
+
+@pytest.fixture(params=("mysql", "aiomysql"))
+def sql_executer(request, server, monkeypatch):
+    """Asynchronous executer of the MySQL backends: the in-memory
+    one has neither unique keys nor SQL for raw queries.
+    """
+    return connect(request.param, server, monkeypatch)
@@ -0,0 +1,71 @@
+"""Delivery acknowledgements of the asyncio consumer."""
+
+import asyncio
+from consumer.ack import AckBatcher
+
+
+class Channel(object):
+    is_open = True
+
+    def __init__(self):
+        self.acks = []
+
+    def basic_ack(self, delivery_tag: int, multiple: bool):
+        self.acks.append((delivery_tag, multiple))
+
+
+def complete(batcher: AckBatcher, *tags):
+    async def main():
+        for tag in tags:
+            batcher.complete(tag)
+
+    asyncio.run(main())
+
+
+def test_contiguous_tags_are_acked_at_once():
+    channel = Channel()
+    batcher = AckBatcher(channel, batch_size=4, interval=60)
+
+    complete(batcher, 2, 1, 4, 3)
+
+    assert channel.acks == [(4, True)]
+    assert batcher.pending == 0
+
+
+def test_pending_head_does_not_hold_back_acks():
+    channel = Channel()
+    batcher = AckBatcher(channel, batch_size=16, interval=60)
+
+    complete(batcher, *range(2, 65))
+
+    # Sent in batches, while the head delivery is still handled.
+    assert len(channel.acks) == 48
+    assert batcher.pending == 15
+
+    batcher.flush()
+
+    # Nothing confirms the head delivery.
+    assert all(tag != 1 for tag, _ in channel.acks)
+    assert all(not multiple for _, multiple in channel.acks)
+    assert sorted(tag for tag, _ in channel.acks) == list(range(2, 65))
+    assert batcher.pending == 0
+
+    complete(batcher, 1)
+    batcher.flush()
+
+    # The only outstanding delivery up to the watermark.
+    assert channel.acks[-1] == (64, True)
+    assert batcher.pending == 0
+
+
+def test_flush_after_gap_is_filled():
+    channel = Channel()
+    batcher = AckBatcher(channel, batch_size=16, interval=60)
+
+    complete(batcher, 1, 3)
+    batcher.flush()
+    complete(batcher, 2, 4)
+    batcher.flush()
+
+    assert channel.acks == [(1, True), (3, False), (4, True)]
+    assert batcher.pending == 0
@@ -0,0 +1,165 @@
+"""Parity of the database executers.
+Tests run against MySQLdb on a thread pool ("mysql"), the
+asyncio driver ("aiomysql") and, where it applies, the
+in-memory tables ("memory").
+"""
+
+import asyncio
+
+
+def run(executer, *operations):
+    """Runs the operations (coroutine functions of the executer)
+    one after another and closes the executer.
+
+    Returns:
+        list: Operation results.
+    """
+
+    async def main():
+        try:
+            return [await operation(executer) for operation in operations]
+
+        finally:
+            await executer.close()
+
+    return asyncio.run(main())
+
+
+def seed(executer):
+    return executer.insert(
+        "toaster", "conversations", conv_id=1, conv_name="one", conv_mark="main"
+    )
+
+
+def test_insert_and_select(executer):
+    *_, rows, marks = run(
+        executer,
+        seed,
+        lambda e: e.insert("toaster", "conversations", conv_id=2, conv_name="two"),
+        lambda e: e.select("toaster", "conversations", ("conv_id", "conv_name")),
+        lambda e: e.select(
+            "toaster", "conversations", fields=("conv_mark",), conv_id=1
+        ),
+    )
+
+    assert sorted(rows) == [(1, "one"), (2, "two")]
+    assert list(marks) == [("main",)]
+
+
+def test_select_comparisons(executer):
+    inserts = [
+        (lambda e, i=i: e.insert("toaster", "conversations", conv_id=i))
+        for i in range(1, 6)
+    ]
+
+    *_, lower, others = run(
+        executer,
+        *inserts,
+        lambda e: e.select("toaster", "conversations", ("conv_id",), conv_id__lt=3),
+        lambda e: e.select(
+            "toaster", "conversations", ("conv_id",), conv_id__ge=2, conv_id__nt=4
+        ),
+    )
+
+    assert sorted(lower) == [(1,), (2,)]
+    assert sorted(others) == [(2,), (3,), (5,)]
+
+
+def test_insert_on_duplicate(sql_executer):
+    def grant(permission: int, on_duplicate: str):
+        return lambda e: e.insert(
+            "toaster",
+            "permissions",
+            on_duplicate=on_duplicate,
+            conv_id=1,
+            user_id=7,
+            user_name="user",
+            user_permission=permission,
+        )
+
+    def permissions(executer):
+        return executer.select("toaster", "permissions", ("user_permission",))
+
+    _, _, ignored, _, updated = run(
+        sql_executer,
+        grant(1, None),
+        grant(2, "ignore"),
+        permissions,
+        grant(2, "update"),
+        permissions,
+    )
+
+    assert list(ignored) == [(1,)]
+    assert list(updated) == [(2,)]
+
+
+def test_update(executer):
+    def setting(name: str):
+        return lambda e: e.insert(
+            "toaster_settings",
+            "settings",
+            conv_id=1,
+            setting_name=name,
+            setting_status=0,
+            setting_destination="system",
+        )
+
+    *_, rows = run(
+        executer,
+        setting("link"),
+        setting("spam"),
+        lambda e: e.update(
+            "toaster_settings",
+            "settings",
+            new_data={"setting_status": 1},
+            conv_id=1,
+            setting_name__nt="spam",
+        ),
+        lambda e: e.update("toaster_settings", "settings", new_data={}),
+        lambda e: e.select(
+            "toaster_settings", "settings", ("setting_name", "setting_status")
+        ),
+    )
+
+    assert sorted(rows) == [("link", 1), ("spam", 0)]
+
+
+def test_delete(executer):
+    *_, rows = run(
+        executer,
+        seed,
+        lambda e: e.insert("toaster", "conversations", conv_id=2),
+        lambda e: e.delete("toaster", "conversations", conv_id=1),
+        lambda e: e.select("toaster", "conversations", ("conv_id",)),
+    )
+
+    assert list(rows) == [(2,)]
+
+
+def test_raw_uses_default_schema(sql_executer, server):
+    *_, first, second = run(
+        sql_executer,
+        seed,
+        lambda e: e.raw("toaster", "SELECT conv_name FROM conversations;"),
+        lambda e: e.raw("toaster", "SELECT conv_mark FROM conversations;"),
+    )
+
+    assert list(first) == [("one",)]
+    assert list(second) == [("main",)]
+    # The connection is switched to the schema only once.
+    assert server.schema_switches == 1
+
+
+def test_values_are_bound(sql_executer, server):
+    name = "O'Brien; DROP TABLE conversations; --"
+
+    *_, rows = run(
+        sql_executer,
+        lambda e: e.insert("toaster", "conversations", conv_id=1, conv_name=name),
+        lambda e: e.select("toaster", "conversations", ("conv_name",), conv_id=1),
+    )
+
+    assert list(rows) == [(name,)]
+    assert all(name not in statement for statement in server.statements)
+    # Table names are qualified instead of USE statements.
+    assert not any(statement.startswith("USE") for statement in server.statements)
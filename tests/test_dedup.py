@@ -0,0 +1,52 @@
+"""Repeated clicks suppression."""
+
+import asyncio
+from dispatcher import Dispatcher
+from handler.dedup import DedupWindow
+from handler.middleware import DedupMiddleware
+
+
+def click(event_id: str) -> dict:
+    return {
+        "event_id": event_id,
+        "user_id": 1,
+        "peer_id": 2000000001,
+        "cmid": 10,
+        "payload": {"call_action": "change_setting", "setting_name": "spam"},
+    }
+
+
+def test_repeated_click_waiting_in_shard_is_suppressed():
+    middleware = DedupMiddleware(DedupWindow(window=0.05, size=100))
+    handled = []
+
+    async def slow_action(event: dict) -> bool:
+        # Longer than the window: the repeated click waits for it.
+        await asyncio.sleep(0.1)
+        handled.append(event["event_id"])
+        return True
+
+    async def handle(event: dict) -> bool:
+        return await middleware(event, None, slow_action)
+
+    async def main():
+        dispatcher = Dispatcher(handle, concurrency=1, queue_size=8)
+        dispatcher.start()
+
+        await dispatcher.submit(click("first"))
+        await asyncio.sleep(0.01)
+        await dispatcher.submit(click("second"))
+        await dispatcher.stop()
+
+    asyncio.run(main())
+
+    assert handled == ["first"]
+    assert middleware.suppressed == 1
+
+
+def test_click_after_window_is_handled():
+    window = DedupWindow(window=0.05, size=100)
+
+    assert not window.is_duplicate(click("first"), received_at=1.0)
+    assert window.is_duplicate(click("second"), received_at=1.04)
+    assert not window.is_duplicate(click("third"), received_at=1.2)
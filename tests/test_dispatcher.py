@@ -0,0 +1,63 @@
+"""Concurrent events dispatching."""
+
+import asyncio
+from dispatcher import Dispatcher
+
+
+def test_busy_conversation_does_not_block_others():
+    handled = []
+
+    async def main():
+        busy = asyncio.Event()
+
+        async def handle(event: dict) -> bool:
+            if event["peer_id"] == 1:
+                await busy.wait()
+
+            handled.append(event["peer_id"])
+            return True
+
+        dispatcher = Dispatcher(handle, concurrency=4, queue_size=64)
+        dispatcher.start()
+
+        # More events of one conversation than a shard used to hold.
+        for _ in range(40):
+            await dispatcher.submit({"peer_id": 1})
+
+        await asyncio.wait_for(dispatcher.submit({"peer_id": 2}), timeout=1)
+        await asyncio.sleep(0)
+        assert handled == [2]
+
+        busy.set()
+        await dispatcher.stop()
+
+    asyncio.run(main())
+
+    assert len(handled) == 41
+
+
+def test_queue_size_bounds_all_shards():
+    async def main():
+        blocked = asyncio.Event()
+
+        async def handle(event: dict) -> bool:
+            await blocked.wait()
+            return True
+
+        dispatcher = Dispatcher(handle, concurrency=4, queue_size=2)
+        dispatcher.start()
+
+        await dispatcher.submit({"peer_id": 1})
+        await dispatcher.submit({"peer_id": 2})
+
+        submit = asyncio.create_task(dispatcher.submit({"peer_id": 3}))
+        await asyncio.sleep(0.01)
+        assert not submit.done()
+
+        blocked.set()
+        await asyncio.wait_for(submit, timeout=1)
+        await dispatcher.stop()
+
+        return dispatcher.handled
+
+    assert asyncio.run(main()) == 3
@@ -0,0 +1,42 @@
+"""Button events handling."""
+
+import asyncio
+from handler import ButtonHandler
+from replay.stubs import StubApi
+
+
+def click(user_id: int, **payload) -> dict:
+    return {
+        "event_id": f"event-{user_id}",
+        "user_id": user_id,
+        "peer_id": 2000000001,
+        "cmid": 10,
+        "payload": {"keyboard_owner": 1, **payload},
+    }
+
+
+def handle(event: dict) -> StubApi:
+    api = StubApi()
+    handler = ButtonHandler(api=api)
+
+    assert not asyncio.run(handler(event))
+    return api
+
+
+def test_other_user_is_denied_access():
+    for event in (
+        click(2, call_action="cancel_command"),
+        # Unknown action and invalid payload are not reported
+        # to a user who does not own the menu.
+        click(2, call_action="no_such_action"),
+        click(2, call_action="change_setting"),
+    ):
+        api = handle(event)
+
+        assert dict(api.calls) == {"messages.sendMessageEventAnswer": 1}
+
+
+def test_owner_with_unknown_action_is_ignored():
+    api = handle(click(1, call_action="no_such_action"))
+
+    assert not api.calls
@@ -0,0 +1,50 @@
+"""Action pipeline timings."""
+
+import asyncio
+from handler.middleware import Middleware
+from handler.pipeline import Pipeline
+
+
+class SlowMiddleware(Middleware):
+    NAME = "slow"
+
+    async def __call__(self, event: dict, action, call_next) -> bool:
+        await asyncio.sleep(0.05)
+        return await call_next(event)
+
+
+class StopMiddleware(Middleware):
+    NAME = "stop"
+
+    async def __call__(self, event: dict, action, call_next) -> bool:
+        if event.get("stop"):
+            return False
+
+        return await call_next(event)
+
+
+class Action(object):
+    NAME = "timed_action"
+
+    async def __call__(self, event: dict) -> bool:
+        await asyncio.sleep(0.1)
+        return True
+
+
+def test_stages_record_own_latency():
+    pipeline = Pipeline([SlowMiddleware(), StopMiddleware()], Action())
+
+    async def main():
+        # Concurrent events of different conversations.
+        await asyncio.gather(pipeline({}), pipeline({}), pipeline({"stop": True}))
+
+    asyncio.run(main())
+
+    slow, stop, action = (
+        pipeline.timings[name] for name in ("slow", "stop", "timed_action")
+    )
+
+    assert (slow.count, stop.count, action.count) == (3, 3, 2)
+    assert 0.04 < slow.mean < 0.07
+    assert stop.mean < 0.01
+    assert 0.09 < action.mean < 0.12
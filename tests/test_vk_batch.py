@@ -0,0 +1,54 @@
+"""VK API calls batching."""
+
+import asyncio
+from replay.vk_server import StubVkServer
+from vk import AsyncVkApi, collecting
+from vk.client import VK_ERRORS, VK_SECONDS
+
+
+def requests(method: str) -> int:
+    return VK_SECONDS.labels(method).count
+
+
+def errors(method: str) -> int:
+    return VK_ERRORS.labels(method).value
+
+
+def call_in_batch(server: StubVkServer):
+    async def main():
+        await server.start()
+        api = AsyncVkApi(token="token", api_version="5.199", url=server.url)
+
+        try:
+            with collecting(api):
+                calls = (
+                    api.messages.edit(peer_id=1, message="text"),
+                    api.messages.sendMessageEventAnswer(event_id="1"),
+                )
+                return await asyncio.gather(*calls, return_exceptions=True)
+
+        finally:
+            await api.close()
+            await server.stop()
+
+    return asyncio.run(main())
+
+
+def test_latency_is_recorded_for_methods_in_execute():
+    before = {m: requests(m) for m in ("execute", "messages.edit")}
+
+    call_in_batch(StubVkServer())
+
+    assert requests("execute") == before["execute"] + 1
+    assert requests("messages.edit") == before["messages.edit"] + 1
+
+
+def test_failed_execute_counts_against_its_methods():
+    before = errors("messages.edit")
+    server = StubVkServer()
+    # VK rejects the whole request.
+    server._execute = lambda code: server._error(5, "User authorization failed")
+    results = call_in_batch(server)
+
+    assert all(isinstance(result, Exception) for result in results)
+    assert errors("messages.edit") == before + 1
@@ -0,0 +1,21 @@
+"""Module "vk".
+About:
+    Asynchronous VK API client with the vk_api call
+    surface: await api.messages.edit(...). Calls made
+    within collecting() are sent in "execute" batches.
+    Cached users.get lookups.
+"""
+
+from .client import AsyncVkApi, VkApiError
+from .batch import CallBatch, collecting
+from .users import UserCache
+from .breaker import CircuitOpenError
+
+__all__ = (
+    "AsyncVkApi",
+    "VkApiError",
+    "CircuitOpenError",
+    "CallBatch",
+    "collecting",
+    "UserCache",
+)
@@ -0,0 +1,196 @@
+"""Module "vk"."""
+
+import json
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from metrics import registry
+
+# VK API limit of method calls in one "execute" request.
+EXECUTE_LIMIT = 25
+
+BATCH_CALLS = registry.histogram(
+    "vk_execute_calls",
+    "Method calls sent in one VK API request.",
+    buckets=(1, 2, 3, 5, 10, 25),
+).labels()
+
+_batch = ContextVar("vk_batch", default=None)
+
+
+class CallBatch(object):
+    """VK API calls collector.
+    Calls are queued as they are made and the queue is sent
+    once the caller yields to the event loop, i.e. when any
+    of the calls is awaited. Queued calls go out in one
+    "execute" request, which runs them as VKScript, and each
+    call gets its own result or error back.
+
+    With linger, a batch shared by concurrent events waits up to
+    linger seconds for more calls, but only while its previous
+    requests are still in flight. So a call is sent right away
+    when traffic is light and bursts are packed into full batches.
+
+    Args:
+        api (AsyncVkApi): VK API client.
+        max_size (int, optional): Maximum count of calls in
+        one request. Defaults to EXECUTE_LIMIT.
+        linger (float, optional): Maximum wait for more calls
+        in seconds. Defaults to 0.
+    """
+
+    def __init__(self, api, max_size: int = EXECUTE_LIMIT, linger: float = 0):
+        self.api = api
+        self.max_size = max_size
+        self.linger = linger
+
+        self._pending = []
+        self._timer: asyncio.Handle = None
+        self._requests = set()
+
+    def add(self, method: str, params: dict) -> asyncio.Future:
+        """Queues the method call.
+
+        Args:
+            method (str): API method name.
+            params (dict): Method parameters.
+
+        Returns:
+            asyncio.Future: Call result.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((method, self.api.prepare(params), future))
+
+        if len(self._pending) >= self.max_size:
+            self.flush()
+
+        elif self._timer is None:
+            if self.linger > 0 and self._requests:
+                self._timer = loop.call_later(self.linger, self.flush)
+
+            else:
+                self._timer = loop.call_soon(self.flush)
+
+        return future
+
+    def flush(self):
+        """Sends queued calls."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        calls, self._pending = self._pending, []
+
+        if not calls:
+            return
+
+        request = asyncio.ensure_future(self._send(calls))
+        self._requests.add(request)
+        request.add_done_callback(self._requests.discard)
+
+    async def _send(self, calls: list):
+        BATCH_CALLS.observe(len(calls))
+
+        try:
+            if len(calls) == 1:
+                method, data, _ = calls[0]
+                body = await self.api.request(method, data)
+                results = [self._single_result(method, body)]
+
+            else:
+                # The batch is as urgent as its most urgent call,
+                # and is retried as its least retried call.
+                methods = [method for method, _, _ in calls]
+                priority = min(self.api.priority(method) for method in methods)
+                body = await self.api.request(
+                    "execute",
+                    {"code": self._script(calls)},
+                    priority,
+                    policy=self.api.retry_policy(*methods),
+                    batched=tuple(methods),
+                )
+                results = self._execute_results(calls, body)
+
+        except Exception as error:
+            results = [error] * len(calls)
+
+        for (_, _, future), result in zip(calls, results):
+            if future.done():
+                continue
+
+            if isinstance(result, Exception):
+                future.set_exception(result)
+
+            else:
+                future.set_result(result)
+
+    def _single_result(self, method: str, body: dict):
+        if "error" in body:
+            return self.api.error(method, body["error"])
+
+        return body.get("response")
+
+    def _execute_results(self, calls: list, body: dict) -> list:
+        if "error" in body:
+            # The whole request failed, so did every call in it.
+            for method, _, _ in calls:
+                self.api.error(method, body["error"])
+
+            return [self.api.error("execute", body["error"])] * len(calls)
+
+        # Failed calls return false, their errors are listed
+        # in "execute_errors" in the same order.
+        errors = iter(body.get("execute_errors") or ())
+        results = []
+
+        for (method, _, _), result in zip(calls, body.get("response") or ()):
+            if result is False:
+                error = next(errors, None) or {"error_msg": "Call failed in execute"}
+                result = self.api.error(method, error)
+
+            results.append(result)
+
+        while len(results) < len(calls):
+            method = calls[len(results)][0]
+            results.append(self.api.error(method, {"error_msg": "No execute result"}))
+
+        return results
+
+    @staticmethod
+    def _script(calls: list) -> str:
+        requests = ",".join(
+            f"API.{method}({json.dumps(data, ensure_ascii=False)})"
+            for method, data, _ in calls
+        )
+        return f"return [{requests}];"
+
+
+def current_batch():
+    """Returns the calls collector of the current context.
+
+    Returns:
+        CallBatch: Collector or None.
+    """
+    return _batch.get()
+
+
+@contextmanager
+def collecting(api, max_size: int = EXECUTE_LIMIT):
+    """Collects VK API calls made in the block
+    (and in tasks it starts) into "execute" batches.
+
+    Args:
+        api (AsyncVkApi): VK API client.
+        max_size (int, optional): Maximum count of calls in
+        one request. Defaults to EXECUTE_LIMIT.
+    """
+    token = _batch.set(CallBatch(api, max_size))
+
+    try:
+        yield
+
+    finally:
+        batch = _batch.get()
+        _batch.reset(token)
+        batch.flush()
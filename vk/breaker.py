@@ -0,0 +1,131 @@
+"""Module "vk"."""
+
+import time
+from metrics import registry
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+STATE = registry.gauge(
+    "vk_circuit_state", "VK API circuit state: 0 closed, 1 half open, 2 open."
+).labels()
+TRANSITIONS = registry.counter(
+    "vk_circuit_transitions_total", "VK API circuit state changes.", ("state",)
+)
+REJECTED = registry.counter(
+    "vk_circuit_rejected_total", "VK API requests rejected by the open circuit."
+).labels()
+
+
+class CircuitOpenError(Exception):
+    """VK API is considered unavailable, request is not sent."""
+
+
+class CircuitBreaker(object):
+    """VK API circuit breaker.
+    After threshold failures in a row the circuit opens and
+    requests fail right away instead of waiting for a degraded
+    API. After reset_timeout one probe request is let through:
+    its success closes the circuit, its failure opens it again.
+    check() returns a token of the probe, so only the probe
+    itself releases the probe slot when it is cancelled.
+
+    Args:
+        threshold (int): Failures in a row opening the circuit.
+        0 disables the breaker.
+        reset_timeout (float): Time in seconds before the probe.
+    """
+
+    _codes = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, threshold: int, reset_timeout: float):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+
+        self._failures = 0
+        self._opened_at = 0.0
+        # Token of the probe in flight, None if there is no probe.
+        self._probe = None
+        self._probes = 0
+
+    def check(self) -> int:
+        """Checks that a request may be sent.
+
+        Raises:
+            CircuitOpenError: Circuit is open.
+
+        Returns:
+            int: Probe token, if the request is the half open
+            circuit probe. None otherwise.
+        """
+        if self.state == CLOSED:
+            return None
+
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                REJECTED.inc()
+                raise CircuitOpenError("VK API circuit is open")
+
+            self._transition(HALF_OPEN)
+
+        if self._probe is not None:
+            REJECTED.inc()
+            raise CircuitOpenError("VK API circuit is half open")
+
+        self._probes += 1
+        self._probe = self._probes
+        return self._probe
+
+    def success(self, probe: int = None):
+        """Records the request VK API served.
+
+        Args:
+            probe (int, optional): Token returned by check(). Defaults to None.
+        """
+        self._failures = 0
+        self._release(probe)
+
+        if self.state != CLOSED:
+            self._transition(CLOSED)
+
+    def failure(self, probe: int = None):
+        """Records the failed request (timeout, server error).
+
+        Args:
+            probe (int, optional): Token returned by check(). Defaults to None.
+        """
+        self._failures += 1
+        self._release(probe)
+
+        if self.threshold <= 0:
+            return
+
+        if self.state == HALF_OPEN or self._failures >= self.threshold:
+            self._opened_at = time.monotonic()
+
+            if self.state != OPEN:
+                self._transition(OPEN)
+
+    def abandon(self, probe: int = None):
+        """Records the request cancelled before its outcome.
+
+        Args:
+            probe (int, optional): Token returned by check(). Defaults to None.
+        """
+        self._release(probe)
+
+    def _release(self, probe: int):
+        if probe is not None and probe == self._probe:
+            self._probe = None
+
+    def _transition(self, state: str):
+        self.state = state
+        # A probe left from the previous half open state no longer
+        # holds the slot: its outcome is recorded, but not waited for.
+        if state != OPEN:
+            self._probe = None
+
+        STATE.set(self._codes[state])
+        TRANSITIONS.labels(state).inc()
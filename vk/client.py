@@ -0,0 +1,418 @@
+"""Module "vk"."""
+
+import time
+import asyncio
+import aiohttp
+import config
+from metrics import registry
+from .batch import CallBatch, current_batch
+from .limiter import RateLimiter, HIGH, NORMAL
+from .retry import RetryPolicy
+from .breaker import CircuitBreaker
+
+VK_SECONDS = registry.histogram(
+    "vk_request_seconds", "VK API request latency.", ("method",)
+)
+VK_ERRORS = registry.counter(
+    "vk_request_errors_total", "Failed VK API requests.", ("method",)
+)
+VK_RETRIES = registry.counter(
+    "vk_request_retries_total", "Retried VK API requests.", ("method",)
+)
+
+# "Unknown error" and "Internal server error".
+SERVER_ERROR_CODES = frozenset((1, 10))
+# "Too many requests per second".
+RATE_LIMIT_CODES = frozenset((6,))
+# Seconds to wait after a rate limit error.
+RATE_LIMIT_DELAY = 1.0
+
+# Methods served first by the rate limiter. Unanswered
+# button events leave the user with a spinning button.
+PRIORITY_METHODS = frozenset(("messages.sendMessageEventAnswer",))
+
+
+class VkApiError(Exception):
+    """VK API error response.
+
+    Args:
+        method (str): API method name.
+        error (dict): "error" object of the response.
+    """
+
+    def __init__(self, method: str, error: dict):
+        self.method = method
+        self.error = error
+        self.code = error.get("error_code")
+
+        super().__init__(f"[{self.code}] {method}: {error.get('error_msg')}")
+
+
+class AsyncVkApi(object):
+    """Asynchronous VK API client.
+    Methods are called the same way as with vk_api, but
+    return awaitables: await api.users.get(user_ids=1).
+    Requests share one keep-alive HTTP session, which is
+    opened on the first call inside the running event loop.
+    Inside collecting() calls are sent in "execute" batches,
+    with linger calls of all events share the batches.
+
+    Args:
+        token (str): Group access token.
+        api_version (str): VK API version.
+        url (str, optional): API base URL. Defaults to VK_API_URL.
+        pool_size (int, optional): Maximum count of open
+        connections. Defaults to VK_POOL_SIZE.
+        timeout (float, optional): Request timeout in seconds.
+        Defaults to VK_TIMEOUT.
+        linger (float, optional): Maximum wait in seconds for calls
+        of concurrent events to share an "execute" request.
+        0 disables cross-event batching. Defaults to VK_BATCH_LINGER.
+        rate (float, optional): Requests per second limit.
+        0 disables the limiter. Defaults to VK_RATE_LIMIT.
+        burst (int, optional): Requests sent at once within
+        the limit. Defaults to VK_RATE_BURST.
+        retries (dict, optional): Count of attempts by method name,
+        overriding VK_RETRY_ATTEMPTS. Defaults to VK_RETRY_METHODS.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        api_version: str,
+        url: str = config.VK_API_URL,
+        pool_size: int = config.VK_POOL_SIZE,
+        timeout: float = config.VK_TIMEOUT,
+        linger: float = config.VK_BATCH_LINGER,
+        rate: float = config.VK_RATE_LIMIT,
+        burst: int = config.VK_RATE_BURST,
+        retries: dict = config.VK_RETRY_METHODS,
+    ):
+        self.token = token
+        self.api_version = api_version
+        self.url = url.rstrip("/")
+        self.pool_size = pool_size
+        self.timeout = timeout
+
+        self._session: aiohttp.ClientSession = None
+        self.limiter = RateLimiter(rate, burst)
+        self.breaker = CircuitBreaker(
+            threshold=config.VK_BREAKER_THRESHOLD,
+            reset_timeout=config.VK_BREAKER_RESET,
+        )
+        self.retry = RetryPolicy(
+            attempts=config.VK_RETRY_ATTEMPTS,
+            base_delay=config.VK_RETRY_DELAY,
+            max_delay=config.VK_RETRY_MAX_DELAY,
+        )
+        # Method name -> RetryPolicy
+        self.retries = {
+            method: RetryPolicy(attempts, self.retry.base_delay, self.retry.max_delay)
+            for method, attempts in retries.items()
+        }
+        # Shared by all events, if cross-event batching is enabled.
+        self.batch: CallBatch = None
+        if linger > 0:
+            self.batch = CallBatch(self, linger=linger)
+
+        self._groups = {}
+        # Method name -> (latency histogram, errors and retries counters)
+        self._metrics = {}
+
+    def __getattr__(self, name: str):
+        group = self._groups.get(name)
+
+        if group is None:
+            group = self._groups[name] = _MethodGroup(self, name)
+
+        return group
+
+    async def call(self, method: str, params: dict):
+        """Calls the API method.
+
+        Args:
+            method (str): API method name, e.g. "messages.edit".
+            params (dict): Method parameters. None values are skipped,
+            lists are joined with commas.
+
+        Raises:
+            VkApiError: API returned an error.
+
+        Returns:
+            object: "response" object of the API response.
+        """
+        body = await self.request(method, self.prepare(params))
+
+        if "error" in body:
+            raise self.error(method, body["error"])
+
+        return body.get("response")
+
+    async def request(
+        self,
+        method: str,
+        data: dict,
+        priority: int = None,
+        policy: RetryPolicy = None,
+        batched: tuple = (),
+    ) -> dict:
+        """Sends the API request as is, waiting for the rate
+        limiter first. Timeouts, server errors and rate limit
+        errors are retried according to the method retry policy.
+
+        Args:
+            method (str): API method name.
+            data (dict): Prepared method parameters.
+            priority (int, optional): Rate limiter priority.
+            Defaults to the priority of the method.
+            policy (RetryPolicy, optional): Retry policy.
+            Defaults to the policy of the method.
+            batched (tuple, optional): Methods called by the "execute"
+            request. Its latency and errors are recorded for each
+            of them as well. Defaults to ().
+
+        Raises:
+            CircuitOpenError: VK API is considered unavailable.
+
+        Returns:
+            dict: Whole API response, including "error"
+            and "execute_errors" objects.
+        """
+        if priority is None:
+            priority = self.priority(method)
+
+        if policy is None:
+            policy = self.retry_policy(method)
+
+        data = dict(data, access_token=self.token, v=self.api_version)
+        attempt = 0
+
+        while True:
+            attempt += 1
+            probe = self.breaker.check()
+
+            try:
+                await self.limiter.acquire(priority)
+                body = await self._post(method, data, batched)
+
+            except asyncio.CancelledError:
+                self.breaker.abandon(probe)
+                raise
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+                minimum = self._retry_after(error)
+
+                # Rate limited or rejected request is still an answer.
+                if minimum is not None or not self._retryable(error):
+                    self.breaker.success(probe)
+
+                else:
+                    self.breaker.failure(probe)
+
+                if attempt >= policy.attempts or not self._retryable(error):
+                    raise
+
+            except Exception:
+                # Malformed response.
+                self.breaker.failure(probe)
+                raise
+
+            else:
+                code = (body.get("error") or {}).get("error_code")
+                minimum = RATE_LIMIT_DELAY if code in RATE_LIMIT_CODES else None
+
+                if code in SERVER_ERROR_CODES:
+                    self.breaker.failure(probe)
+
+                else:
+                    self.breaker.success(probe)
+
+                    if minimum is None:
+                        return body
+
+                if attempt >= policy.attempts:
+                    return body
+
+            self._method_metrics(method)[2].inc()
+            await asyncio.sleep(policy.delay(attempt, minimum or 0.0))
+
+    async def _post(self, method: str, data: dict, batched: tuple = ()) -> dict:
+        started = time.perf_counter()
+        failed = False
+
+        try:
+            async with self.session.post(f"{self.url}/{method}", data=data) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+
+        except Exception:
+            failed = True
+            raise
+
+        finally:
+            elapsed = time.perf_counter() - started
+
+            for name in (method, *batched):
+                latency, errors, _ = self._method_metrics(name)
+                latency.observe(elapsed)
+
+                if failed:
+                    errors.inc()
+
+    @staticmethod
+    def _retryable(error: Exception) -> bool:
+        # Client errors (4xx) are not fixed by retrying, except 429.
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status >= 500 or error.status == 429
+
+        return True
+
+    @staticmethod
+    def _retry_after(error: Exception) -> float:
+        """Returns the delay demanded by HTTP 429 response,
+        None for other errors.
+        """
+        if not isinstance(error, aiohttp.ClientResponseError) or error.status != 429:
+            return None
+
+        try:
+            return float((error.headers or {}).get("Retry-After", RATE_LIMIT_DELAY))
+
+        except ValueError:
+            return RATE_LIMIT_DELAY
+
+    def error(self, method: str, error: dict) -> VkApiError:
+        """Counts the failed method call.
+
+        Args:
+            method (str): API method name.
+            error (dict): API error object.
+
+        Returns:
+            VkApiError: Exception to raise.
+        """
+        self._method_metrics(method)[1].inc()
+        return VkApiError(method, error)
+
+    def retry_policy(self, *methods: str) -> RetryPolicy:
+        """Returns the retry policy of the methods. A request
+        carrying several method calls (execute) is retried
+        as few times as the strictest of them allows.
+
+        Returns:
+            RetryPolicy: Retry policy.
+        """
+        policies = [self.retries.get(method, self.retry) for method in methods]
+        return min(policies, key=lambda policy: policy.attempts)
+
+    @staticmethod
+    def priority(method: str) -> int:
+        """Returns the rate limiter priority of the method.
+
+        Args:
+            method (str): API method name.
+
+        Returns:
+            int: HIGH or NORMAL.
+        """
+        return HIGH if method in PRIORITY_METHODS else NORMAL
+
+    def prepare(self, params: dict) -> dict:
+        """Converts method parameters to request fields.
+
+        Args:
+            params (dict): Method parameters.
+
+        Returns:
+            dict: Parameters without None values, with
+            lists joined with commas and bools as 0/1.
+        """
+        return {
+            key: self._format(value)
+            for key, value in params.items()
+            if value is not None
+        }
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Returns the HTTP session, opening it if needed.
+
+        Returns:
+            aiohttp.ClientSession: HTTP session.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+
+        return self._session
+
+    async def close(self):
+        """Closes the HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _method_metrics(self, method: str) -> tuple:
+        metrics = self._metrics.get(method)
+
+        if metrics is None:
+            metrics = self._metrics[method] = (
+                VK_SECONDS.labels(method),
+                VK_ERRORS.labels(method),
+                VK_RETRIES.labels(method),
+            )
+
+        return metrics
+
+    @staticmethod
+    def _format(value) -> str:
+        if isinstance(value, (list, tuple, set)):
+            return ",".join(str(item) for item in value)
+
+        if isinstance(value, bool):
+            return str(int(value))
+
+        return str(value)
+
+
+class _MethodGroup(object):
+    """API methods group, e.g. "messages"."""
+
+    def __init__(self, api: AsyncVkApi, name: str):
+        self._api = api
+        self._name = name
+        self._methods = {}
+
+    def __getattr__(self, name: str):
+        method = self._methods.get(name)
+
+        if method is None:
+            method = self._methods[name] = _Method(self._api, f"{self._name}.{name}")
+
+        return method
+
+
+class _Method(object):
+    """API method, e.g. "messages.edit"."""
+
+    __slots__ = ("_api", "_name")
+
+    def __init__(self, api: AsyncVkApi, name: str):
+        self._api = api
+        self._name = name
+
+    def __call__(self, **params):
+        batch = self._api.batch
+
+        if batch is None:
+            batch = current_batch()
+
+            if batch is not None and batch.api is not self._api:
+                batch = None
+
+        if batch is not None:
+            return batch.add(self._name, params)
+
+        return self._api.call(self._name, params)
@@ -0,0 +1,107 @@
+"""Module "vk"."""
+
+import time
+import heapq
+import asyncio
+import itertools
+from metrics import registry
+
+# Lower value is served first.
+HIGH = 0
+NORMAL = 1
+
+WAIT_SECONDS = registry.histogram(
+    "vk_rate_limit_wait_seconds",
+    "Time VK API requests waited for the rate limiter.",
+    ("priority",),
+)
+
+
+class RateLimiter(object):
+    """Asynchronous token bucket limiter.
+    Requests exceeding the rate are queued instead of failing
+    and released as tokens refill, higher priority first and
+    in arrival order within a priority.
+
+    Args:
+        rate (float): Requests per second. 0 disables the limiter.
+        burst (int, optional): Maximum count of requests
+        sent at once. Defaults to 1.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        # (priority, arrival number, future)
+        self._waiters = []
+        self._arrivals = itertools.count()
+        self._timer: asyncio.TimerHandle = None
+        self._wait = {
+            HIGH: WAIT_SECONDS.labels("high"),
+            NORMAL: WAIT_SECONDS.labels("normal"),
+        }
+
+    @property
+    def queued(self) -> int:
+        """Returns the count of waiting requests."""
+        return sum(not future.done() for _, _, future in self._waiters)
+
+    async def acquire(self, priority: int = NORMAL) -> float:
+        """Waits for the permission to send a request.
+
+        Args:
+            priority (int, optional): HIGH or NORMAL. Defaults to NORMAL.
+
+        Returns:
+            float: Wait time in seconds.
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        started = time.monotonic()
+        self._refill(started)
+
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            self._wait[priority].observe(0.0)
+            return 0.0
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._arrivals), future))
+        self._schedule()
+
+        # Cancelled waiter stays in the heap and is skipped on release.
+        await future
+
+        waited = time.monotonic() - started
+        self._wait[priority].observe(waited)
+        return waited
+
+    def _release(self):
+        self._timer = None
+        self._refill(time.monotonic())
+
+        while self._waiters and self._tokens >= 1:
+            _, _, future = heapq.heappop(self._waiters)
+
+            if future.done():
+                continue
+
+            self._tokens -= 1
+            future.set_result(None)
+
+        self._schedule()
+
+    def _schedule(self):
+        if self._timer is not None or not self._waiters:
+            return
+
+        delay = max(0.0, (1 - self._tokens) / self.rate)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._release)
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
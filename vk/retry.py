@@ -0,0 +1,35 @@
+"""Module "vk"."""
+
+import random
+
+
+class RetryPolicy(object):
+    """VK API request retry policy.
+    Exponential backoff with full jitter: the delay before
+    the retry is random, up to base_delay * 2 ** retry_number,
+    so retries of concurrent requests do not come in waves.
+
+    Args:
+        attempts (int): Maximum count of attempts, 1 - no retries.
+        base_delay (float): Delay of the first retry in seconds.
+        max_delay (float): Maximum delay in seconds.
+    """
+
+    def __init__(self, attempts: int, base_delay: float, max_delay: float):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, retry: int, minimum: float = 0.0) -> float:
+        """Returns the delay before the retry.
+
+        Args:
+            retry (int): Retry number, starting from 1.
+            minimum (float, optional): Delay demanded by the server,
+            e.g. after a rate limit error. Defaults to 0.
+
+        Returns:
+            float: Delay in seconds.
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (retry - 1))
+        return max(minimum, random.uniform(0, ceiling))
@@ -0,0 +1,122 @@
+"""Module "vk"."""
+
+import time
+import asyncio
+from collections import OrderedDict
+from metrics import registry
+
+# VK API limit of user_ids in one users.get call.
+USERS_GET_LIMIT = 1000
+
+LOOKUPS = registry.counter(
+    "vk_user_cache_lookups_total", "User name cache lookups.", ("result",)
+)
+
+
+class UserCache(object):
+    """User names cache with TTL and LRU eviction.
+    Misses collected within one event loop step, including
+    the ones of concurrent events, are loaded with a single
+    users.get call. A user being loaded is not requested twice.
+
+    Args:
+        api (AsyncVkApi): VK API client.
+        ttl (float): Time to keep a name in seconds.
+        size (int): Maximum count of cached names.
+    """
+
+    def __init__(self, api, ttl: float, size: int):
+        self.api = api
+        self.ttl = ttl
+        self.size = size
+
+        # user_id -> (name, expiration time), recently used last.
+        self._names = OrderedDict()
+        # user_id -> future of the name being loaded.
+        self._loading = {}
+        self._queued = []
+        self._requests = set()
+        self._hits = LOOKUPS.labels("hit")
+        self._misses = LOOKUPS.labels("miss")
+
+    async def get_name(self, user_id: int) -> str:
+        """Returns the full name of the user.
+
+        Args:
+            user_id (int): User ID.
+
+        Returns:
+            str: User full name, "Unknown" if VK does not know the user.
+        """
+        user_id = int(user_id)
+        cached = self._names.get(user_id)
+
+        if cached is not None and cached[1] > time.monotonic():
+            self._names.move_to_end(user_id)
+            self._hits.inc()
+            return cached[0]
+
+        self._misses.inc()
+        future = self._loading.get(user_id)
+
+        if future is None:
+            future = self._load(user_id)
+
+        # Shielded, so a cancelled caller does not fail the others.
+        return await asyncio.shield(future)
+
+    def _load(self, user_id: int) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = self._loading[user_id] = loop.create_future()
+
+        if not self._queued:
+            loop.call_soon(self._flush)
+
+        self._queued.append(user_id)
+        return future
+
+    def _flush(self):
+        queued, self._queued = self._queued, []
+
+        for start in range(0, len(queued), USERS_GET_LIMIT):
+            request = asyncio.ensure_future(
+                self._request(queued[start : start + USERS_GET_LIMIT])
+            )
+            self._requests.add(request)
+            request.add_done_callback(self._requests.discard)
+
+    async def _request(self, user_ids: list):
+        try:
+            users = await self.api.users.get(user_ids=user_ids)
+
+        except Exception as error:
+            for user_id in user_ids:
+                future = self._loading.pop(user_id)
+                if not future.done():
+                    future.set_exception(error)
+                    # Awaiting callers get the error anyway,
+                    # marked retrieved for callers that left.
+                    future.exception()
+
+            return
+
+        names = {
+            user.get("id"): f"{user.get('first_name')} {user.get('last_name')}"
+            for user in users or ()
+        }
+        expires = time.monotonic() + self.ttl
+
+        for user_id in user_ids:
+            name = names.get(user_id, "Unknown")
+            self._remember(user_id, name, expires)
+
+            future = self._loading.pop(user_id)
+            if not future.done():
+                future.set_result(name)
+
+    def _remember(self, user_id: int, name: str, expires: float):
+        self._names[user_id] = (name, expires)
+        self._names.move_to_end(user_id)
+
+        while len(self._names) > self.size:
+            self._names.popitem(last=False)